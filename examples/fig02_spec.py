@@ -11,9 +11,17 @@ What this script does:
     Demonstrates how to set up a SPEC CPU 2017 benchmark in perfaid and
     expose run-to-run variability on hybrid-core processors. The campaign
     runs 500.perlbench_r repeatedly under the default Linux scheduler with
-    a stress-ng background load across all CPUs. On hybrid-core machines,
-    this produces multimodal runtimes because the OS scheduler may place
-    the workload on either fast P-cores or slower E-cores.
+    a background CPU load. On hybrid-core machines, this produces
+    multimodal runtimes because the OS scheduler may place the workload on
+    either fast P-cores or slower E-cores.
+
+    Unlike the paper, whose background load ran on all CPUs, the load is
+    deliberately pinned to half of the E-cores (detected by
+    ``lib/platforms.py``), so that the runtime spread reflects the
+    scheduler's placement decisions rather than preemption by the load.
+    On machines without E-cores, all CPUs are loaded, as in the paper. The load is a set of
+    pinned busy-loop processes (``lib/noise.py``), which behaves the same on
+    every machine, unlike stress-ng whose work depends on its version.
 
     The resulting strip plot (Figure 5, left, "No Pinning" condition) shows
     the spread of runtimes, motivating the controlled placement experiments
@@ -31,7 +39,7 @@ Expected execution time:
 
 Prerequisites:
     - SPEC CPU 2017 ISO image (e.g., cpu2017-1.1.9.iso)
-    - System packages: build-essential, cmake, fuseiso, stress-ng
+    - System packages: build-essential, cmake, fuseiso
     - Python environment set up (see README)
 
 How to run:
@@ -42,42 +50,21 @@ Output:
     - CSV results and a strip-plot (PNG/PDF) in ~/.benchkit/results/
     - Strip plot shows runtime variability under default scheduling
 """
-import argparse
-import sys
-from pathlib import Path
+import os
 
 from benchkit import CampaignCartesianProduct
 from benchkit.benches.speccpu2017 import SPECCPU2017Bench
-from benchkit.platforms import get_current_platform
+
+from lib import cpu_noise, detect_core_types, parse_spec_iso_arg
 
 
 def main() -> None:
-    parser = argparse.ArgumentParser(
-        description="Figure 2: SPEC CPU 2017 baseline variability experiment.",
-    )
-    parser.add_argument(
-        "spec_iso",
-        type=Path,
-        help="Path to the SPEC CPU 2017 ISO image (e.g., /path/to/cpu2017-1.1.9.iso)",
-    )
-    args = parser.parse_args()
-
-    spec_iso = args.spec_iso.expanduser().resolve()
-    if not spec_iso.exists():
-        print(f"Error: SPEC ISO not found: {spec_iso}", file=sys.stderr)
-        sys.exit(1)
-
-    platform = get_current_platform()
-
-    # Start background load to stress the scheduler and expose placement effects
-    # (as described in Section 3.1 of the paper).
-    stressng = platform.comm.background_subprocess(
-        command=["stress-ng", "--cpu", "0"],
-        stdout=Path("/tmp/stress-ng.out").open("w"),
-        stderr=Path("/tmp/stress-ng.err").open("w"),
-        cwd="/tmp",
-        env=None,
-    )
+    spec_iso = parse_spec_iso_arg("Figure 2: SPEC CPU 2017 baseline variability experiment.")
+
+    # Background load to stress the scheduler and expose placement effects. Deviation
+    # from the paper (all CPUs loaded): half of the E-cores only, see module docstring.
+    _, e_cores = detect_core_types()
+    noise_cores = e_cores[: len(e_cores) // 2] or sorted(os.sched_getaffinity(0))
 
     campaign = CampaignCartesianProduct(
         name="fig02_spec_baseline",
@@ -94,10 +81,8 @@ def main() -> None:
         },
     )
 
-    campaign.run()
-
-    # Stop stress-ng background load
-    stressng.kill()
+    with cpu_noise(noise_cores):
+        campaign.run()
 
     campaign.generate_graph(
         plot_name="stripplot",
@@ -16,6 +16,10 @@ What this script does:
     The heater is a tight C loop that counts operations while pinned via
     sched_setaffinity. perfaid sweeps all CPUs declaratively.
 
+    Other tasks remain schedulable on the measured CPU and add noise to its
+    count. The script reports which CPUs are isolated (``isolcpus=``) and,
+    if none are, recommends isolating them for lower per-CPU variance.
+
 Hardware used in the paper:
     Platform A - hybrid-core laptop (AMD Ryzen AI 9 HX 370, 24 cores).
     Works on any Linux machine; results will reflect whatever core topology
@@ -42,14 +46,26 @@ import os
 
 from benchkit.benches.heater.sequential import heater_seq_campaign
 
+from lib import get_isolated_cpus
+
 
 def main() -> None:
+    isolated_cpus = get_isolated_cpus()
+    if isolated_cpus:
+        print(f"Isolated CPUs (isolcpus): {isolated_cpus}")
+    else:
+        print(
+            "[INFO] No isolated CPUs: other tasks may run on the measured CPU.\n"
+            "       For lower per-CPU variance, boot with isolcpus=<cpus> (or move\n"
+            "       other tasks away with a cgroup v2 cpuset) before the sweep."
+        )
+
     # Create a campaign that runs the heater on each CPU
     campaign = heater_seq_campaign(
         name="fig03_heater",
         nb_runs=3,
         duration_s=3,
-        cpu=range(0, os.cpu_count()),
+        cpu=sorted(os.sched_getaffinity(0)),
     )
 
     # Execute the campaign
@@ -20,9 +20,11 @@ What this script does:
 
 Hardware used in the paper:
     Platform A - hybrid-core laptop (AMD Ryzen AI 9 HX 370, 24 cores).
-    The P_CORES and E_CORES lists below must be adjusted for your hardware.
-    Run fig03_heater.py first to identify which cores are fast (P) vs. slow (E).
-    On a homogeneous machine, all three conditions will yield similar results.
+    The P_CORES and E_CORES lists are detected from sysfs (see
+    ``lib/platforms.py``); fig03_heater.py can be used to cross-check which
+    cores are fast (P) vs. slow (E). On a homogeneous machine, all CPUs are
+    reported as P-cores, the E-core list is empty (no pinning) and all three
+    conditions will yield similar results.
 
 Expected execution time:
     ~20 minutes (3 placements x 100 runs; each run executes 40 000 iterations).
@@ -30,7 +32,6 @@ Expected execution time:
 Prerequisites:
     - System packages: build-essential, cmake, libsnappy-dev
     - Python environment set up (see README)
-    - Adjust P_CORES / E_CORES constants below for your CPU
 
 How to run:
     cd examples/
@@ -45,11 +46,10 @@ from benchkit import CampaignCartesianProduct
 from benchkit.benches.leveldb import LevelDBBench
 from benchkit.commandwrappers.taskset import TasksetWrap
 
-# CPU configuration for AMD Ryzen AI 9 HX 370
-# Adjust these for your specific hybrid-core processor.
-# Use fig03_heater.py to identify P-cores (high throughput) vs E-cores (lower throughput).
-P_CORES = [0, 1, 2, 3, 12, 13, 14, 15]
-E_CORES = [4, 5, 6, 7, 8, 9, 10, 11, 16, 17, 18, 19, 20, 21, 22, 23]
+from lib import detect_core_types
+
+# P-cores and E-cores of this machine (see lib.platforms.detect_core_types)
+P_CORES, E_CORES = detect_core_types()
 
 
 def main() -> None:
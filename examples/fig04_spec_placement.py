@@ -17,7 +17,7 @@ What this script does:
 
 Hardware used in the paper:
     Platform A - hybrid-core laptop (AMD Ryzen AI 9 HX 370, 24 cores).
-    Adjust P_CORES / E_CORES for your hardware (use fig03_heater.py to identify).
+    P_CORES / E_CORES are detected from sysfs (cross-check with fig03_heater.py).
 
 Expected execution time:
     ~5-10 minutes with size="test", ~90-120 minutes with size="ref".
@@ -26,7 +26,6 @@ Prerequisites:
     - SPEC CPU 2017 ISO image (e.g., cpu2017-1.1.9.iso)
     - System packages: build-essential, cmake, fuseiso
     - Python environment set up (see README)
-    - Adjust P_CORES / E_CORES constants for your CPU
 
 How to run:
     cd examples/
@@ -36,36 +35,19 @@ Output:
     - CSV results and a strip-plot (PNG/PDF) in ~/.benchkit/results/
     - Strip plot shows runtime variability across placements
 """
-import argparse
-import sys
-from pathlib import Path
 
 from benchkit import CampaignCartesianProduct
 from benchkit.benches.speccpu2017 import SPECCPU2017Bench
 from benchkit.commandwrappers.taskset import TasksetWrap
 
-# CPU configuration for AMD Ryzen AI 9 HX 370
-# Adjust these for your specific hybrid-core processor.
-# Use fig03_heater.py to identify P-cores (high throughput) vs E-cores (lower throughput).
-P_CORES = [0, 1, 2, 3, 12, 13, 14, 15]
-E_CORES = [4, 5, 6, 7, 8, 9, 10, 11, 16, 17, 18, 19, 20, 21, 22, 23]
+from lib import detect_core_types, parse_spec_iso_arg
 
+# P-cores and E-cores of this machine (see lib.platforms.detect_core_types)
+P_CORES, E_CORES = detect_core_types()
 
-def main() -> None:
-    parser = argparse.ArgumentParser(
-        description="Figure 4: SPEC CPU 2017 placement experiment with TasksetWrap.",
-    )
-    parser.add_argument(
-        "spec_iso",
-        type=Path,
-        help="Path to the SPEC CPU 2017 ISO image (e.g., /path/to/cpu2017-1.1.9.iso)",
-    )
-    args = parser.parse_args()
 
-    spec_iso = args.spec_iso.expanduser().resolve()
-    if not spec_iso.exists():
-        print(f"Error: SPEC ISO not found: {spec_iso}", file=sys.stderr)
-        sys.exit(1)
+def main() -> None:
+    spec_iso = parse_spec_iso_arg("Figure 4: SPEC CPU 2017 placement experiment with TasksetWrap.")
 
     campaign = CampaignCartesianProduct(
         name="fig04_placement_spec",
@@ -16,6 +16,11 @@ What this script does:
     Lock algorithms tested: CAS, TTAS, Ticket, MCS, Hemlock, CNA, HMCS,
     and the default glibc pthread_mutex baseline.
 
+    Note that readrandom contends on two kinds of mutexes: the DB mutex and
+    the block-cache shard mutexes (16 shards, LevelDB's compile-time
+    kNumShardBits = 4). All of them are interposed, so the selected lock
+    replaces both; the shard count is not a campaign variable.
+
 Hardware used in the paper:
     Platform B - NUMA server (2x Kunpeng 920-4826, 96 cores, aarch64).
     Works on any Linux machine; thread counts are automatically filtered
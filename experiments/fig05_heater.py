@@ -14,12 +14,21 @@ What this script does:
     The resulting core-to-speed mapping is used to configure P_CORES / E_CORES
     for the placement experiments (fig05_placement_spec.py, fig05_placement_leveldb.py).
 
+    By default (NB_WORKERS = 1), one CPU is measured at a time, as in the
+    paper: a shared turbo budget or thermal headroom would make concurrent
+    measurements unrepresentative. With NB_WORKERS > 1, the sweep is split
+    across that many campaigns running at the same time. Whole physical
+    cores are dealt round-robin to the workers, so two CPUs measured at the
+    same time never are SMT siblings. The first CPU is measured alone, which
+    builds the heater before the workers start.
+
 Hardware used in the paper:
     Platform A - hybrid-core laptop (AMD Ryzen AI 9 HX 370, 24 cores).
     Works on any Linux machine; homogeneous machines show a flat bar chart.
 
 Expected execution time:
-    ~3 minutes on a 24-core machine (24 CPUs x 3 runs x 3 s = 216 s).
+    ~3 minutes on a 24-core machine (24 CPUs x 3 runs x 3 s = 216 s);
+    about NB_WORKERS times less with concurrent workers.
 
 Prerequisites:
     - System packages: build-essential, cmake
@@ -35,24 +44,61 @@ Output:
 """
 
 import os
+from typing import List, Set
 
 from benchkit.benches.heater.sequential import heater_seq_campaign
+from benchkit.campaign import Campaign, CampaignSuite
 
+from lib import get_physical_cores, run_campaigns_concurrently
 
-def main() -> None:
-    # Create a campaign that runs the heater on each CPU
-    campaign = heater_seq_campaign(
-        name="fig05_heater",
+# Number of CPUs measured at the same time, each on its own physical core
+# (opt-in: concurrent measurements may share a turbo budget, see module docstring)
+NB_WORKERS = 1
+
+
+def _get_campaign(name: str, cpus: List[int]) -> Campaign:
+    return heater_seq_campaign(
+        name=name,
         nb_runs=3,
         duration_s=3,
-        cpu=range(0, os.cpu_count()),
+        cpu=cpus,
     )
 
-    # Execute the campaign
-    campaign.run()
+
+def _get_worker_campaigns(allowed_cpus: Set[int]) -> List[Campaign]:
+    # Deal whole physical cores to the workers, so that concurrent runs never share a core
+    cores = [[cpu for cpu in core if cpu in allowed_cpus] for core in get_physical_cores()]
+    workers = [
+        sorted(cpu for core in cores[w::NB_WORKERS] for cpu in core) for w in range(NB_WORKERS)
+    ]
+    workers = [cpus for cpus in workers if cpus]
+
+    # The first CPU runs alone, building the heater before the workers share its build directory
+    first_cpu, workers[0] = workers[0][0], workers[0][1:]
+    return [_get_campaign(name="fig05_heater", cpus=[first_cpu])] + [
+        _get_campaign(name=f"fig05_heater_worker{w}", cpus=cpus)
+        for w, cpus in enumerate(workers)
+        if cpus
+    ]
+
+
+def main() -> None:
+    allowed_cpus = os.sched_getaffinity(0)
+    if NB_WORKERS == 1:
+        # Measure one CPU at a time in a single campaign
+        campaigns = [_get_campaign(name="fig05_heater", cpus=sorted(allowed_cpus))]
+    else:
+        campaigns = _get_worker_campaigns(allowed_cpus)
+
+    # Execute the campaigns; only the workers (all but the first) run concurrently
+    groups = [campaigns[:1]]
+    if campaigns[1:]:
+        groups.append(campaigns[1:])
+    run_campaigns_concurrently(groups)
 
     # Generate a bar plot showing per-CPU throughput
-    campaign.generate_graph(
+    suite = CampaignSuite(campaigns=campaigns)
+    suite.generate_graph(
         plot_name="barplot",
         x="cpu",
         y="ops",
@@ -13,6 +13,15 @@ What this script does:
     readrandom under three CPU placements (No Pinning, P-Cores, E-Cores) with
     100 repetitions each, producing a strip plot that shows throughput variability.
 
+    Every run is a fresh LevelDB process, so that each run gets its own
+    initial placement from the scheduler. The placement is applied by
+    pre/post-run hooks (AffinityPin, see ``lib/affinity.py``) rather than a
+    `taskset` process per run. Memory is also bound to the NUMA node(s) of
+    the selected CPUs (like `numactl --membind`), so that a pinned run never
+    allocates on a remote node; on single-node machines this has no effect.
+    The placements run one after the other, so that no run shares the
+    last-level cache or memory bandwidth with another measurement.
+
     The paper's Figure 5 (left) uses SPEC CPU 2017 - see fig05_placement_spec.py for that
     version (requires a SPEC license). This script demonstrates the same
     methodology and perfaid features without proprietary dependencies.
@@ -20,8 +29,8 @@ What this script does:
 Hardware used in the paper:
     Platform A - hybrid-core laptop (AMD Ryzen AI 9 HX 370, 8 P-cores + 16
     E-cores, 24 total, 32 GiB RAM, Manjaro 26.0.1, Linux 6.18+).
-    Adjust P_CORES / E_CORES for your hardware. Run examples/fig03_heater.py
-    first to identify which cores are P vs. E.
+    P_CORES / E_CORES are detected from sysfs; run examples/fig03_heater.py
+    to cross-check which cores are P vs. E.
 
 Expected execution time:
     ~5 minutes (3 placements x 100 runs, each run is short: 40 000 iterations).
@@ -29,7 +38,7 @@ Expected execution time:
 Prerequisites:
     - System packages: build-essential, cmake, libsnappy-dev
     - Python environment set up (see README)
-    - Adjust P_CORES / E_CORES constants below for your CPU
+    - Check the detected P_CORES / E_CORES constants below for your CPU
 
 How to run:
     cd experiments/
@@ -42,13 +51,14 @@ Output:
 
 from benchkit import CampaignCartesianProduct
 from benchkit.benches.leveldb import LevelDBBench
-from benchkit.commandwrappers.taskset import TasksetWrap
 
-# CPU configuration for AMD Ryzen AI 9 HX 370
-# Adjust these for your specific hybrid-core processor.
-# Use fig03_heater.py to identify P-cores (high throughput) vs E-cores (lower throughput).
-P_CORES = [0, 1, 2, 3, 12, 13, 14, 15]
-E_CORES = [4, 5, 6, 7, 8, 9, 10, 11, 16, 17, 18, 19, 20, 21, 22, 23]
+from lib import AffinityPin, detect_core_types
+
+# P-cores and E-cores of this machine (see lib.platforms.detect_core_types)
+P_CORES, E_CORES = detect_core_types()
+
+# Pin to the placement CPUs and bind memory to their NUMA node(s)
+AFFINITY = AffinityPin(bind_memory=True)
 
 
 def main() -> None:
@@ -65,7 +75,8 @@ def main() -> None:
                 "e_cores": E_CORES,  # Pin to E-cores only
             },
         },
-        command_wrappers=[TasksetWrap(set_all_cpus=True)],
+        pre_run_hooks=[AFFINITY.pin_hook],
+        post_run_hooks=[AFFINITY.unpin_hook],
         nb_runs=100,
         pretty={
             "cpu_list": {
@@ -41,16 +41,14 @@ Output:
 """
 
 
-import argparse
 import os
-import sys
 from pathlib import Path
 
 from benchkit import CampaignCartesianProduct
 from benchkit.benches.speccpu2017 import SPECCPU2017Bench
 from benchkit.commandwrappers.taskset import TasksetWrap
 
-from lib import get_platform
+from lib import get_platform, parse_spec_iso_arg
 
 # ---- User-tunable defaults -------------------------------------------------
 
@@ -71,7 +69,7 @@ def run_placement_experiment(
     nb_runs: int = DEFAULT_NB_RUNS,
     bench_name: str = DEFAULT_BENCH_NAME,
     size: str = DEFAULT_SIZE,
-    nb_threads: int = os.cpu_count(),
+    nb_threads: int = len(os.sched_getaffinity(0)),
     benchkit_home: Path = DEFAULT_BENCHKIT_HOME,
 ):
     """
@@ -134,20 +132,7 @@ def run_placement_experiment(
 
 
 def main() -> None:
-    parser = argparse.ArgumentParser(
-        description="Figure 5 (left): SPEC CPU 2017 placement experiment.",
-    )
-    parser.add_argument(
-        "spec_iso",
-        type=Path,
-        help="Path to the SPEC CPU 2017 ISO image (e.g., /path/to/cpu2017-1.1.9.iso)",
-    )
-    args = parser.parse_args()
-
-    spec_iso = args.spec_iso.expanduser().resolve()
-    if not spec_iso.exists():
-        print(f"Error: SPEC ISO not found: {spec_iso}", file=sys.stderr)
-        sys.exit(1)
+    spec_iso = parse_spec_iso_arg("Figure 5 (left): SPEC CPU 2017 placement experiment.")
 
     run_placement_experiment(
         spec_iso=spec_iso,
@@ -28,9 +28,26 @@ Hardware used in the paper:
     high thread counts) may differ on non-NUMA or small-core-count machines.
 
 Expected execution time:
-    ~96 minutes on the paper's 96-core server (with duration=5, nb_runs=2).
+    ~96 minutes on the paper's 96-core server (with duration=5, nb_runs=2)
+    for the full 12-point thread sweep (PERFAID_SWEEP=full).
     Measured: real 95m39s. Scales with core count and number of locks.
 
+    By default (PERFAID_SWEEP=fast), a geometric subset of 6 thread counts
+    is run in about half the time (~48 minutes); see get_thread_sweep in
+    lib/cli.py.
+
+Concurrent panels (CONCURRENT_PANELS, off by default):
+    The five panels are independent benchmarks, but each one saturates the
+    machine at high thread counts. When enabled, the thread counts that fit
+    in 1/3rd of the CPUs are run for several panels at the same time, each
+    panel pinned to its own disjoint slice of CPUs; the remaining thread
+    counts run one panel at a time as before. Panels of the same benchmark
+    share its build directory and database, so they never run together:
+    KyotoCabinet, LevelDB readrandom and RocksDB readrandom run first, then
+    the two seekrandom panels. This shortens the low-thread part of the
+    sweep about 2.5x, but the pinned low-thread runs share the memory system
+    with the other panels, so the paper's numbers were obtained serially.
+
 Prerequisites:
     - System packages: build-essential, cmake, libsnappy-dev, libgflags-dev,
       liblz4-dev, libzstd-dev, zlib1g-dev (for RocksDB)
@@ -38,23 +55,40 @@ Prerequisites:
 
 How to run:
     cd experiments/
-    python fig07_locks.py
+    python fig07_locks.py                       # fast sweep
+    PERFAID_SWEEP=full python fig07_locks.py    # full sweep (paper)
 
 Output:
-    - CSV results per panel and line-plots (PNG/PDF) in ~/.benchkit/results/
-    - One line plot per panel: throughput vs. threads, one line per lock
+    - CSV results per panel in ~/.benchkit/results/
+    - ~/.benchkit/results/fig07_locks.{pdf,png}: one line plot per panel
+      (throughput vs. threads, one line per lock)
 """
 
+import os
+from typing import Any, Dict, List
+
 from benchkit import CampaignCartesianProduct
 from benchkit.benches.kyotocabinet import KyotoCabinetBench
 from benchkit.benches.leveldb import LevelDBBench
 from benchkit.benches.rocksdb import RocksDBBench
 from benchkit.campaign import CampaignSuite
+from benchkit.platforms import Platform
+from benchkit.sharedlibs.tiltlib import TiltLib
 
-from lib import LOCKS, PRETTY_LOCKS, Panel, get_platform, get_tilt_lib
+from lib import (
+    LOCKS,
+    PRETTY_LOCKS,
+    AffinityPin,
+    Panel,
+    get_platform,
+    get_thread_sweep,
+    get_tilt_lib,
+    run_campaigns_concurrently,
+)
+from lib.results import plot_panels
 
-# Experiment configuration (values used for plot generation in submission)
-THREADS = [1, 2, 4, 8, 16, 24, 32, 64, 72, 80, 88, 96]
+# Thread counts of the sweep selected by PERFAID_SWEEP (see module docstring)
+THREADS = get_thread_sweep()
 # NB_RUNS = 3
 # DURATION_S = 10
 
@@ -62,13 +96,46 @@ THREADS = [1, 2, 4, 8, 16, 24, 32, 64, 72, 80, 88, 96]
 NB_RUNS = 2
 DURATION_S = 5
 
+# One instance per benchmark, shared by its panels (readrandom and seekrandom
+# use the same db_bench binary, only bench_name differs)
+_KYOTOCABINET = KyotoCabinetBench()
+_LEVELDB = LevelDBBench()
+_ROCKSDB = RocksDBBench()
+
+# Run the low-thread part of all panels concurrently (see module docstring)
+CONCURRENT_PANELS = False
+
+AFFINITY = AffinityPin()
+
+
+def _get_campaign(
+    name: str,
+    panel: Panel,
+    variables: Dict[str, Any],
+    platform: Platform,
+    tiltlib: TiltLib,
+    pinned: bool = False,
+) -> CampaignCartesianProduct:
+    return CampaignCartesianProduct(
+        name=name,
+        benchmark=panel.bench,
+        shared_libs=[tiltlib],
+        variables=variables,
+        pre_run_hooks=[AFFINITY.pin_hook] if pinned else [],
+        post_run_hooks=[AFFINITY.unpin_hook] if pinned else [],
+        pretty={"lock": PRETTY_LOCKS},
+        nb_runs=NB_RUNS,
+        duration_s=DURATION_S,
+        platform=platform,
+    )
+
 
 def main() -> None:
     platform = get_platform()
     tiltlib = get_tilt_lib(platform=platform)
 
-    # Filter thread counts to available CPUs
-    max_cpus = platform.nb_cpus()
+    # Filter thread counts to the CPUs this process may run on (cgroup/cpuset aware)
+    max_cpus = min(platform.nb_cpus(), len(os.sched_getaffinity(0)))
     threads = [t for t in THREADS if t <= max_cpus]
 
     # Define the panels (one per benchmark/workload)
@@ -76,7 +143,7 @@ def main() -> None:
         Panel(
             name="kyotocabinet",
             campaign_name="fig07_kyotocabinet",
-            bench=KyotoCabinetBench(),
+            bench=_KYOTOCABINET,
             parameter_space={
                 "nb_threads": threads,
                 "lock": LOCKS,
@@ -85,7 +152,7 @@ def main() -> None:
         Panel(
             name="leveldb/readrandom",
             campaign_name="fig07_leveldb_readrandom",
-            bench=LevelDBBench(),
+            bench=_LEVELDB,
             parameter_space={
                 "nb_threads": threads,
                 "bench_name": ["readrandom"],
@@ -95,7 +162,7 @@ def main() -> None:
         Panel(
             name="leveldb/seekrandom",
             campaign_name="fig07_leveldb_seekrandom",
-            bench=LevelDBBench(),
+            bench=_LEVELDB,
             parameter_space={
                 "nb_threads": threads,
                 "bench_name": ["seekrandom"],
@@ -105,7 +172,7 @@ def main() -> None:
         Panel(
             name="rocksdb/readrandom",
             campaign_name="fig07_rocksdb_readrandom",
-            bench=RocksDBBench(),
+            bench=_ROCKSDB,
             parameter_space={
                 "nb_threads": threads,
                 "bench_name": ["readrandom"],
@@ -115,7 +182,7 @@ def main() -> None:
         Panel(
             name="rocksdb/seekrandom",
             campaign_name="fig07_rocksdb_seekrandom",
-            bench=RocksDBBench(),
+            bench=_ROCKSDB,
             parameter_space={
                 "nb_threads": threads,
                 "bench_name": ["seekrandom"],
@@ -124,35 +191,84 @@ def main() -> None:
         ),
     ]
 
-    # Create campaigns for each panel
-    campaigns = [
-        CampaignCartesianProduct(
-            name=p.campaign_name,
-            benchmark=p.bench,
-            shared_libs=[tiltlib],
-            variables=p.parameter_space,
-            pretty={"lock": PRETTY_LOCKS},
-            nb_runs=NB_RUNS,
-            duration_s=DURATION_S,
-            platform=platform,
-        )
-        for p in panels
-    ]
+    # Panels of the same benchmark share its build directory and database, so
+    # the k-th panel of each benchmark goes in the k-th concurrent round
+    rounds: List[List[int]] = []
+    nb_bench_panels: Dict[int, int] = {}
+    for i, p in enumerate(panels):
+        k = nb_bench_panels.get(id(p.bench), 0)
+        nb_bench_panels[id(p.bench)] = k + 1
+        if k == len(rounds):
+            rounds.append([])
+        rounds[k].append(i)
 
-    # Run all campaigns
-    suite = CampaignSuite(campaigns=campaigns)
+    # Thread counts that fit in a per-panel slice of CPUs can run concurrently
+    cpus = sorted(os.sched_getaffinity(0))
+    slice_size = len(cpus) // max(len(r) for r in rounds)
+    if CONCURRENT_PANELS and slice_size > 0:
+        low_threads = [t for t in threads if t <= slice_size]
+    else:
+        low_threads = []
+    high_threads = [t for t in threads if t not in low_threads]
+
+    # Create campaigns for each panel: serial (high threads) and concurrent (low threads)
+    serial_campaigns = []
+    concurrent_rounds: List[List[CampaignCartesianProduct]] = [[] for _ in rounds]
+    panel_campaigns: List[List[CampaignCartesianProduct]] = [[] for _ in panels]
+    for i, p in enumerate(panels):
+        if high_threads:
+            campaign = _get_campaign(
+                name=p.campaign_name,
+                panel=p,
+                variables={**p.parameter_space, "nb_threads": high_threads},
+                platform=platform,
+                tiltlib=tiltlib,
+            )
+            serial_campaigns.append(campaign)
+            panel_campaigns[i].append(campaign)
+    for r, round_panels in enumerate(rounds if low_threads else []):
+        for j, i in enumerate(round_panels):
+            p = panels[i]
+            start, end = j * slice_size, (j + 1) * slice_size
+            campaign = _get_campaign(
+                name=f"{p.campaign_name}_concurrent",
+                panel=p,
+                variables={
+                    **p.parameter_space,
+                    "nb_threads": low_threads,
+                    "cpu_list": {f"slice{j}": cpus[start:end]},
+                },
+                platform=platform,
+                tiltlib=tiltlib,
+                pinned=True,
+            )
+            concurrent_rounds[r].append(campaign)
+            panel_campaigns[i].append(campaign)
+    concurrent_rounds = [c for c in concurrent_rounds if c]
+
+    # Run all campaigns; the serial ones go first so that every benchmark is
+    # built before the concurrent rounds start
+    concurrent_campaigns = [c for round_campaigns in concurrent_rounds for c in round_campaigns]
+    suite = CampaignSuite(campaigns=serial_campaigns + concurrent_campaigns)
     suite.print_durations()
-    suite.run_suite()
-
-    # Generate individual graphs for each panel
-    for panel, campaign in zip(panels, campaigns):
-        campaign.generate_graph(
-            plot_name="lineplot",
-            x="nb_threads",
-            y="throughput",
-            hue="lock",
-            title=f"Lock throughput - {panel.name}",
-        )
+    groups = [[c] for c in serial_campaigns]
+    if not serial_campaigns and concurrent_rounds:
+        # Nothing built yet: the first round runs one campaign at a time
+        groups.extend([c] for c in concurrent_rounds.pop(0))
+    groups.extend(concurrent_rounds)
+    run_campaigns_concurrently(groups)
+
+    # Generate the multi-panel figure
+    plot_panels(
+        panels=panels,
+        panel_campaigns=panel_campaigns,
+        x="nb_threads",
+        y="throughput",
+        hue="lock",
+        pretty_hue=PRETTY_LOCKS,
+        title="Lock throughput",
+        file_name="fig07_locks",
+    )
 
     print("\nResults saved to: ~/.benchkit/results/")
 
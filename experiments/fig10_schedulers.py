@@ -26,9 +26,28 @@ Hardware used in the paper:
     differences compared to the default Linux scheduler.
 
 Expected execution time:
-    ~96 minutes on the paper's 96-core server (with duration=5, nb_runs=2).
+    ~96 minutes on the paper's 96-core server (with duration=5, nb_runs=2)
+    for the full 12-point thread sweep (PERFAID_SWEEP=full).
     Measured: real 95m26s. Scales with core count and number of schedulers.
 
+    By default (PERFAID_SWEEP=fast), a geometric subset of 6 thread counts
+    is run in about half the time (~48 minutes); see get_thread_sweep in
+    lib/cli.py.
+
+    Unlike fig07_locks.py, the panels cannot run concurrently: the schedkit
+    daemon started by the pre-run hook is global to the machine.
+
+Scheduler daemon options (SCHEDKIT_*, see get_scheduler in lib/schedulers.py):
+    SCHEDKIT_CAPTURE_LOGS keeps the daemon output of each run next to its
+    results; set it to False to spare the daemon that disk I/O.
+    SCHEDKIT_HOUSEKEEPING_CPU pins the daemon to one CPU, so that it does not
+    wake up on the CPUs of the benchmark.
+    SCHEDKIT_REUSE_DAEMON keeps the daemon running between consecutive runs
+    of the same policy instead of restarting it, at the cost of carrying its
+    state over from one run to the next.
+    The defaults (logs kept, daemon unpinned and restarted for every run)
+    are the settings used for the paper.
+
 Prerequisites:
     - System packages: build-essential, cmake, libsnappy-dev, libgflags-dev,
       liblz4-dev, libzstd-dev, zlib1g-dev (for RocksDB)
@@ -36,23 +55,28 @@ Prerequisites:
 
 How to run:
     cd experiments/
-    python fig10_schedulers.py
+    python fig10_schedulers.py                       # fast sweep
+    PERFAID_SWEEP=full python fig10_schedulers.py    # full sweep (paper)
 
 Output:
-    - CSV results per panel and line-plots (PNG/PDF) in ~/.benchkit/results/
-    - One line plot per panel: throughput vs. threads, one line per scheduler
+    - CSV results per panel in ~/.benchkit/results/
+    - ~/.benchkit/results/fig10_schedulers.{pdf,png}: one line plot per panel
+      (throughput vs. threads, one line per scheduler)
 """
 
+import os
+
 from benchkit import CampaignCartesianProduct
 from benchkit.benches.kyotocabinet import KyotoCabinetBench
 from benchkit.benches.leveldb import LevelDBBench
 from benchkit.benches.rocksdb import RocksDBBench
 from benchkit.campaign import CampaignSuite
 
-from lib import PRETTY_SCHEDULERS, SCHEDULERS, Panel, get_platform, get_scheduler
+from lib import PRETTY_SCHEDULERS, SCHEDULERS, Panel, get_platform, get_scheduler, get_thread_sweep
+from lib.results import plot_panels
 
-# Experiment configuration (values used for plot generation in submission)
-THREADS = [1, 2, 4, 8, 16, 24, 32, 64, 72, 80, 88, 96]
+# Thread counts of the sweep selected by PERFAID_SWEEP (see module docstring)
+THREADS = get_thread_sweep()
 # NB_RUNS = 3
 # DURATION_S = 10
 
@@ -60,13 +84,29 @@ THREADS = [1, 2, 4, 8, 16, 24, 32, 64, 72, 80, 88, 96]
 NB_RUNS = 2
 DURATION_S = 5
 
+# One instance per benchmark, shared by its panels (readrandom and seekrandom
+# use the same db_bench binary, only bench_name differs)
+_KYOTOCABINET = KyotoCabinetBench()
+_LEVELDB = LevelDBBench()
+_ROCKSDB = RocksDBBench()
+
+# Scheduler daemon options (see module docstring)
+SCHEDKIT_CAPTURE_LOGS = True
+SCHEDKIT_HOUSEKEEPING_CPU = None
+SCHEDKIT_REUSE_DAEMON = False
+
 
 def main() -> None:
     platform = get_platform()
-    schedkit = get_scheduler(platform=platform)
-
-    # Filter thread counts to available CPUs
-    max_cpus = platform.nb_cpus()
+    schedkit = get_scheduler(
+        platform=platform,
+        capture_logs=SCHEDKIT_CAPTURE_LOGS,
+        housekeeping_cpu=SCHEDKIT_HOUSEKEEPING_CPU,
+        reuse_daemon=SCHEDKIT_REUSE_DAEMON,
+    )
+
+    # Filter thread counts to the CPUs this process may run on (cgroup/cpuset aware)
+    max_cpus = min(platform.nb_cpus(), len(os.sched_getaffinity(0)))
     threads = [t for t in THREADS if t <= max_cpus]
 
     # Define the panels (one per benchmark/workload)
@@ -74,7 +114,7 @@ def main() -> None:
         Panel(
             name="kyotocabinet",
             campaign_name="fig10_kyotocabinet",
-            bench=KyotoCabinetBench(),
+            bench=_KYOTOCABINET,
             parameter_space={
                 "nb_threads": threads,
                 "scheduler": SCHEDULERS,
@@ -83,7 +123,7 @@ def main() -> None:
         Panel(
             name="leveldb/readrandom",
             campaign_name="fig10_leveldb_readrandom",
-            bench=LevelDBBench(),
+            bench=_LEVELDB,
             parameter_space={
                 "nb_threads": threads,
                 "bench_name": ["readrandom"],
@@ -93,7 +133,7 @@ def main() -> None:
         Panel(
             name="leveldb/seekrandom",
             campaign_name="fig10_leveldb_seekrandom",
-            bench=LevelDBBench(),
+            bench=_LEVELDB,
             parameter_space={
                 "nb_threads": threads,
                 "bench_name": ["seekrandom"],
@@ -103,7 +143,7 @@ def main() -> None:
         Panel(
             name="rocksdb/readrandom",
             campaign_name="fig10_rocksdb_readrandom",
-            bench=RocksDBBench(),
+            bench=_ROCKSDB,
             parameter_space={
                 "nb_threads": threads,
                 "bench_name": ["readrandom"],
@@ -113,7 +153,7 @@ def main() -> None:
         Panel(
             name="rocksdb/seekrandom",
             campaign_name="fig10_rocksdb_seekrandom",
-            bench=RocksDBBench(),
+            bench=_ROCKSDB,
             parameter_space={
                 "nb_threads": threads,
                 "bench_name": ["seekrandom"],
@@ -143,15 +183,17 @@ def main() -> None:
     suite.print_durations()
     suite.run_suite()
 
-    # Generate individual graphs for each panel
-    for panel, campaign in zip(panels, campaigns):
-        campaign.generate_graph(
-            plot_name="lineplot",
-            x="nb_threads",
-            y="throughput",
-            hue="scheduler",
-            title=f"Scheduler throughput - {panel.name}",
-        )
+    # Generate the multi-panel figure
+    plot_panels(
+        panels=panels,
+        panel_campaigns=[[c] for c in campaigns],
+        x="nb_threads",
+        y="throughput",
+        hue="scheduler",
+        pretty_hue=PRETTY_SCHEDULERS,
+        title="Scheduler throughput",
+        file_name="fig10_schedulers",
+    )
 
     print("\nResults saved to: ~/.benchkit/results/")
 
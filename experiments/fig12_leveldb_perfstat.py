@@ -17,6 +17,13 @@ What this script does:
     system-wide events. The PerfStatWrap wrapper and its post-run hook
     handle perf invocation and result parsing automatically.
 
+    With PERSISTENT_PERF = True, a single system-wide `perf stat -I` process
+    counts for the whole campaign instead (PerfStatInterval, see
+    ``lib/perfstat.py``), and each run is attributed the intervals that
+    elapsed while it ran. This avoids setting up the counters 18 times, but
+    the counts then include the whole machine and are only delimited to the
+    interval granularity (100 ms).
+
 Hardware used in the paper:
     Platform B - NUMA server (2x Kunpeng 920-4826, 96 cores across 4 NUMA
     nodes, 539 GiB RAM, Ubuntu 20.04.6 LTS, kernel 5.4.0-200-generic, aarch64).
@@ -43,13 +50,23 @@ from benchkit import CampaignCartesianProduct
 from benchkit.benches.leveldb import LevelDBBench
 from benchkit.commandwrappers.perf import PerfStatWrap, enable_non_sudo_perf
 
-from lib import PRETTY_SCHEDULERS, SCHEDULERS, get_platform, get_scheduler
+from lib import PRETTY_SCHEDULERS, SCHEDULERS, PerfStatInterval, get_platform, get_scheduler
 
 # Experiment configuration
 NB_THREADS = 24
 NB_RUNS = 3
 DURATION_S = 30
 
+# Count with one perf stat process for the whole campaign (see module docstring)
+PERSISTENT_PERF = False
+
+EVENTS = [
+    "context-switches",
+    "cpu-migrations",
+    "page-faults",
+    "cache-misses",
+]
+
 
 def main() -> None:
     platform = get_platform()
@@ -59,18 +76,22 @@ def main() -> None:
 
     schedkit = get_scheduler(platform=platform)
 
-    # Configure perf stat
-    perf_stat = PerfStatWrap(
-        events=[
-            "context-switches",
-            "cpu-migrations",
-            "page-faults",
-            "cache-misses",
-        ],
-        use_json=False,
-        separator=";",
-        aggregate_hybrid=True,
-    )
+    # Configure perf stat: one perf process per run, or one for the whole campaign
+    if PERSISTENT_PERF:
+        perf_stat = PerfStatInterval(events=EVENTS)
+        command_wrappers = []
+        pre_run_hooks = [perf_stat.start_hook, schedkit.start_sched_hook]
+        perf_post_run_hook = perf_stat.update_results_hook
+    else:
+        perf_stat = PerfStatWrap(
+            events=EVENTS,
+            use_json=False,
+            separator=";",
+            aggregate_hybrid=True,
+        )
+        command_wrappers = [perf_stat]
+        pre_run_hooks = [schedkit.start_sched_hook]
+        perf_post_run_hook = perf_stat.post_run_hook_update_results
 
     campaign = CampaignCartesianProduct(
         name="fig12_leveldb_perfstat",
@@ -83,16 +104,20 @@ def main() -> None:
         pretty={"scheduler": PRETTY_SCHEDULERS},
         nb_runs=NB_RUNS,
         duration_s=DURATION_S,
-        command_wrappers=[perf_stat],
-        pre_run_hooks=[schedkit.start_sched_hook],
+        command_wrappers=command_wrappers,
+        pre_run_hooks=pre_run_hooks,
         post_run_hooks=[
             schedkit.end_sched_hook,
-            perf_stat.post_run_hook_update_results,
+            perf_post_run_hook,
         ],
         platform=platform,
     )
 
-    campaign.run()
+    try:
+        campaign.run()
+    finally:
+        if PERSISTENT_PERF:
+            perf_stat.close()
 
     # Generate all 5 panels
     metrics = [
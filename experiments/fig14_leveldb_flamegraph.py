@@ -31,6 +31,8 @@ Prerequisites:
     - Perf access: sudo sysctl -w kernel.perf_event_paranoid=-1
     - Python environment set up (see README)
     - FlameGraph tools are fetched automatically on first run
+    - Optional: inferno (`cargo install inferno`) renders the differential
+      flame graphs faster than flamegraph.pl
 
 How to run:
     cd experiments/
@@ -42,14 +44,19 @@ Output:
     - All stored under ~/.benchkit/results/
 """
 
+from pathlib import Path
+from typing import List
+
 from benchkit import CampaignCartesianProduct
 from benchkit.benches.leveldb import LevelDBBench
 from benchkit.commandwrappers.perf import PerfReportWrap, enable_non_sudo_perf
 from benchkit.utils.dir import get_tools_dir
 
 from lib import (
+    fetch_flamegraph_tools,
+    find_files,
     flame_post_hook,
-    generate_differential_flamegraph,
+    generate_differential_flamegraphs,
     get_platform,
     get_scheduler,
     get_tilt_lib,
@@ -79,8 +86,11 @@ def main() -> None:
         flamegraph_path=flamegraph_dir,
     )
 
+    # Folded stack files of the runs, collected by the flame graph hook
+    folded_paths: List[Path] = []
+
     # Fetch FlameGraph tools if not present
-    perf_record.fetch_flamegraph()
+    fetch_flamegraph_tools(perf_record=perf_record, flamegraph_dir=flamegraph_dir)
 
     campaign = CampaignCartesianProduct(
         name="fig14_leveldb_flamegraph",
@@ -99,7 +109,7 @@ def main() -> None:
         post_run_hooks=[
             schedkit.end_sched_hook,
             perf_record.post_run_hook_report,
-            flame_post_hook(perf_record=perf_record),
+            flame_post_hook(perf_record=perf_record, folded_paths=folded_paths),
         ],
         platform=platform,
     )
@@ -117,7 +127,6 @@ def main() -> None:
 
     # Generate differential flame graphs
     results_path = campaign.base_data_dir()
-    folded_paths = sorted(results_path.rglob("perf.folded"))
 
     if len(folded_paths) != 2:
         print(f"[WARN] Expected 2 folded files, got {len(folded_paths)}:")
@@ -128,27 +137,21 @@ def main() -> None:
     src_folded, dst_folded = folded_paths[0], folded_paths[1]
     subtitle = f" ({DURATION_S} sec., {NB_THREADS} threads, {SCHEDULER} scheduler)"
 
-    # Differential: CAS vs MCS (red = more time in CAS)
-    generate_differential_flamegraph(
-        perf_record=perf_record,
-        src_folded_path=src_folded,
-        dst_folded_path=dst_folded,
-        out_svg_path=results_path / "diff_cas_vs_mcs.svg",
-        flamegraph_subtitle="CAS lock against MCS lock" + subtitle,
-    )
-
-    # Differential: MCS vs CAS (red = more time in MCS)
-    generate_differential_flamegraph(
-        perf_record=perf_record,
-        src_folded_path=dst_folded,
-        dst_folded_path=src_folded,
-        out_svg_path=results_path / "diff_mcs_vs_cas.svg",
-        flamegraph_subtitle="MCS lock against CAS lock" + subtitle,
+    # Differential: CAS vs MCS (red = more time in CAS) and MCS vs CAS
+    # (red = more time in MCS), parsing each folded file once
+    generate_differential_flamegraphs(
+        flamegraph_dir=flamegraph_dir,
+        a_folded_path=src_folded,
+        b_folded_path=dst_folded,
+        a_vs_b_svg_path=results_path / "diff_cas_vs_mcs.svg",
+        b_vs_a_svg_path=results_path / "diff_mcs_vs_cas.svg",
+        a_vs_b_subtitle="CAS lock against MCS lock" + subtitle,
+        b_vs_a_subtitle="MCS lock against CAS lock" + subtitle,
     )
 
     print(f"\nResults directory: {results_path}")
     print("\nGenerated flame graphs:")
-    for svg in sorted(results_path.rglob("*.svg")):
+    for svg in sorted(find_files(results_path, suffix=".svg")):
         print(f"  {svg}")
 
 
@@ -13,7 +13,8 @@ What this script does:
     with equivalent hand-written shell scripts (shell_host.sh, shell_docker.sh).
 
     The script:
-    1. Builds a Docker image (perfaid_overhead) using pythainer
+    1. Builds a Docker image (perfaid_overhead) using pythainer, unless an
+       image built from the same Dockerfile already exists
     2. Runs a benchkit campaign on the host (fig15_leveldb_host)
     3. Runs a benchkit campaign inside Docker (fig15_leveldb_docker)
     4. Generates a strip plot comparing host vs. Docker throughput
@@ -31,16 +32,20 @@ Hardware used in the paper:
 
 Expected execution time:
     ~15-20 minutes total:
-      - Docker image build: ~2 minutes (first time only)
+      - Docker image build: ~2 minutes (first time only; skipped while the
+        generated Dockerfile is unchanged)
       - benchkit host campaign: ~5 minutes (3 threads x 10 runs x 10 s)
       - benchkit Docker campaign: ~5 minutes (same)
+    With CONCURRENT_CAMPAIGNS = True (and at least 2 x 8 CPUs), both campaigns
+    run at the same time on disjoint halves of the CPUs: ~5 minutes less.
 
 Prerequisites:
     - System packages: build-essential, cmake, libsnappy-dev
     - Docker installed and current user in docker group
     - Python environment set up (see README)
 
-How to run (full Figure 15 reproduction):
+How to run (full Figure 15 reproduction; to pin every step to the same CPUs,
+e.g. for tighter distributions, export PERFAID_FIG15_CPUS=0-7 first):
     cd experiments/fig15_overhead/
 
     # Step 1: Run benchkit campaigns (host + Docker)
@@ -59,18 +64,25 @@ Output:
     - Final figure: ~/.benchkit/results/fig15_overhead.{pdf,png}
 """
 
+import hashlib
+import os
+import subprocess
+import tempfile
 from pathlib import Path
+from typing import List
 
 from benchkit import CampaignCartesianProduct
 from benchkit.benches.leveldb import LevelDBBench
 from benchkit.campaign import CampaignSuite
+from benchkit.commandwrappers.taskset import TasksetWrap
 from benchkit.communication.docker import DockerCommLayer
 from benchkit.platforms import Platform
 from benchkit.utils.dir import benchkit_home_dir, gitmainrootdir
+from pythainer.builders import DockerBuilder
 from pythainer.examples.builders import get_user_builder
 from pythainer.runners import ConcreteDockerRunner
 
-from lib import get_platform
+from lib import AffinityPin, get_platform, parse_cpu_list, run_campaigns_concurrently
 
 # Note: Run this script before shell_host.sh/shell_docker.sh, as it builds the
 # Docker image and clones the LevelDB repository that the shell scripts reuse.
@@ -82,6 +94,22 @@ NB_RUNS = 10
 DURATION_S = 10
 THREADS = [2, 4, 8]
 
+# Run the host and Docker campaigns at the same time, each on its own half of
+# the CPUs (only if each half fits the largest thread count). Off by default:
+# the shell baselines run alone on the whole machine, and the overhead
+# comparison assumes the campaigns do too.
+CONCURRENT_CAMPAIGNS = False
+
+AFFINITY = AffinityPin()
+
+# Optional CPU list (e.g., "0-7") all fig15 benchmarks are restricted to: the
+# container gets it as its cpuset and the host runs are pinned to it. Set the
+# same variable for shell_host.sh and shell_docker.sh to keep the comparison fair.
+CPUS = os.environ.get("PERFAID_FIG15_CPUS", "")
+
+# Packages installed in the Docker image on top of the pythainer user image
+DOCKER_PACKAGES = ["libsnappy-dev"]
+
 
 def _get_os_version() -> str:
     """Get the current OS version for Docker base image."""
@@ -94,6 +122,38 @@ def _get_os_version() -> str:
     return f"{osinfo['ID']}:{osinfo['VERSION_ID']}"
 
 
+def _image_is_current(image_name: str, config_tag: str) -> bool:
+    """
+    Check whether the image was built from the current Dockerfile.
+
+    Each build is also tagged with a digest of its Dockerfile, so the image
+    is current if both names exist and refer to the same image.
+    """
+    result = subprocess.run(
+        ["docker", "image", "inspect", "--format={{.Id}}", image_name, config_tag],
+        check=False,
+        capture_output=True,
+        text=True,
+    )
+    image_ids = result.stdout.split()
+    return result.returncode == 0 and len(image_ids) == 2 and image_ids[0] == image_ids[1]
+
+
+def _get_dockerfile_digest(builder: DockerBuilder) -> str:
+    """
+    Get a digest of the Dockerfile generated by a pythainer builder.
+
+    The build also passes the user and group ids of the current user, so they
+    are part of the digest too.
+    """
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        dockerfile_path = Path(tmp_dir) / "Dockerfile"
+        builder.generate_dockerfile(dockerfile_paths=[dockerfile_path])
+        digest = hashlib.sha1(dockerfile_path.read_bytes())
+    digest.update(f"{os.getuid()}:{os.getgid()}".encode())
+    return digest.hexdigest()[:12]
+
+
 def _get_docker_platform() -> Platform:
     """Create a Docker platform for container experiments."""
     image_name = "perfaid_overhead"
@@ -101,16 +161,21 @@ def _get_docker_platform() -> Platform:
     docker_path = Path(work_dir)
     repo_dir = gitmainrootdir().resolve()
 
-    # Build Docker image
+    # Build Docker image, unless it was already built from the same Dockerfile
     builder = get_user_builder(
         image_name=image_name,
         base_ubuntu_image=_get_os_version(),
     )
     builder.root()
-    builder.add_packages(packages=["libsnappy-dev"])
+    builder.add_packages(packages=DOCKER_PACKAGES)
     builder.user()
     builder.workdir(path=work_dir)
-    builder.build()
+    config_tag = f"{image_name}:cfg-{_get_dockerfile_digest(builder)}"
+    if _image_is_current(image_name=image_name, config_tag=config_tag):
+        print(f"Docker image {image_name} is up to date, skipping build")
+    else:
+        builder.build()
+        subprocess.run(["docker", "image", "tag", image_name, config_tag], check=True)
 
     # Configure volume mounts
     host_benchkit_dir = benchkit_home_dir().expanduser() / "docker"
@@ -124,6 +189,7 @@ def _get_docker_platform() -> Platform:
             f"{repo_dir}": f"{docker_path}",
             f"{host_benchkit_dir}": f"{dock_benchkit_dir}",
         },
+        other_options=[f"--cpuset-cpus={CPUS}"] if CPUS else [],
     )
 
     comm = DockerCommLayer(docker_runner=runner)
@@ -135,19 +201,34 @@ def _get_campaign(
     name: str,
     run_type: str,
     platform: Platform,
+    cpus: List[int],
+    in_docker: bool = False,
 ):
-    """Create a LevelDB campaign for the given platform."""
+    """
+    Create a LevelDB campaign for the given platform.
+
+    With a non-empty ``cpus`` list, the benchmark is pinned to those CPUs:
+    through the affinity of the campaign on the host, and with ``taskset``
+    inside the container (which does not inherit the affinity of the campaign).
+    """
+    variables = {
+        "bench_name": ["readrandom"],
+        "nb_threads": THREADS,
+    }
+    if cpus:
+        variables["cpu_list"] = {run_type: cpus}
+    pinned_on_host = bool(cpus) and not in_docker
     return CampaignCartesianProduct(
         name=name,
         benchmark=LevelDBBench(),
         nb_runs=NB_RUNS,
-        variables={
-            "bench_name": ["readrandom"],
-            "nb_threads": THREADS,
-        },
+        variables=variables,
         constants={
             "run_type": run_type,
         },
+        command_wrappers=[TasksetWrap(set_all_cpus=True)] if cpus and in_docker else [],
+        pre_run_hooks=[AFFINITY.pin_hook] if pinned_on_host else [],
+        post_run_hooks=[AFFINITY.unpin_hook] if pinned_on_host else [],
         duration_s=DURATION_S,
         platform=platform,
     )
@@ -157,23 +238,40 @@ def main() -> None:
     host_platform = get_platform()
     docker_platform = _get_docker_platform()
 
-    suite = CampaignSuite(
-        campaigns=[
-            _get_campaign(
-                name="fig15_leveldb_docker",
-                run_type="benchkit_docker",
-                platform=docker_platform,
-            ),
-            _get_campaign(
-                name="fig15_leveldb_host",
-                run_type="benchkit_host",
-                platform=host_platform,
-            ),
-        ]
-    )
+    # Split the CPUs in two halves when running the campaigns concurrently;
+    # otherwise only pin the host runs, to the CPUs of the container (if set)
+    cpus = parse_cpu_list(CPUS) if CPUS else sorted(os.sched_getaffinity(0))
+    half = len(cpus) // 2
+    concurrent = CONCURRENT_CAMPAIGNS and half >= max(THREADS)
+    if concurrent:
+        docker_cpus, host_cpus = cpus[:half], cpus[half:]
+    else:
+        docker_cpus = []
+        host_cpus = cpus if CPUS else []
+
+    campaigns = [
+        _get_campaign(
+            name="fig15_leveldb_docker",
+            run_type="benchkit_docker",
+            platform=docker_platform,
+            cpus=docker_cpus,
+            in_docker=True,
+        ),
+        _get_campaign(
+            name="fig15_leveldb_host",
+            run_type="benchkit_host",
+            platform=host_platform,
+            cpus=host_cpus,
+        ),
+    ]
+    suite = CampaignSuite(campaigns=campaigns)
 
     suite.print_durations()
-    suite.run_suite()
+    if concurrent:
+        # The container builds LevelDB in its own benchkit home, so no build is shared
+        run_campaigns_concurrently([campaigns])
+    else:
+        suite.run_suite()
 
     suite.generate_graph(
         plot_name="stripplot",
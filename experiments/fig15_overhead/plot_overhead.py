@@ -17,8 +17,10 @@ What this script does:
     Produces a 3-panel strip plot (one per thread count: 2, 4, 8) comparing
     perfaid vs. shell throughput, faceted by execution environment.
 
-    Also prints an overhead summary table showing the percentage difference
-    between perfaid and shell for each thread count and environment.
+    Also prints every collected run (or, with PERFAID_SUMMARY=1, the median
+    and standard deviation of each configuration instead), and an overhead
+    summary table showing the percentage difference between perfaid and
+    shell for each thread count and environment.
 
 Prerequisites:
     Run these three scripts first (in order):
@@ -30,46 +32,121 @@ How to run:
     cd experiments/fig15_overhead/
     python plot_overhead.py
 
+    # Also show the figure in a window (from a terminal)
+    PERFAID_INTERACTIVE=1 python plot_overhead.py
+
+    # Print per-configuration statistics instead of every run
+    PERFAID_SUMMARY=1 python plot_overhead.py
+
 Output:
     - ~/.benchkit/results/fig15_overhead.pdf
     - ~/.benchkit/results/fig15_overhead.png
     - Overhead summary table printed to console
+    - ~/.benchkit/results/.fig15_cache.parquet: parsed results of all sources,
+      reused by later runs while the inputs are unchanged (requires pyarrow)
 """
 
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from importlib.util import find_spec
 from pathlib import Path
+from typing import List, Optional
 
-import matplotlib.pyplot as plt
 import pandas as pd
-import seaborn as sns
 
-# from benchkit.benches.leveldb import LevelDBBench
-from benchkit.charts.dataframes import get_dataframe
+from lib.files import find_files
+from lib.results import read_campaign_csv, summarize_runs
 
 RESULTS_DIR = Path.home() / ".benchkit" / "results"
 
+# Only open the figure in a window when asked to, from a terminal: by default
+# the figure is just saved, with the non-interactive Agg backend
+INTERACTIVE = sys.stdout.isatty() and os.environ.get("PERFAID_INTERACTIVE", "0") == "1"
+
+# Print the median and spread of each configuration instead of the raw runs
+SUMMARY = os.environ.get("PERFAID_SUMMARY", "0") == "1"
+
+# Unified results of all sources, reused while the inputs are the same files
+# and none of them is newer (needs pyarrow); the input list is kept next to it
+CACHE_PATH = RESULTS_DIR / ".fig15_cache.parquet"
+CACHE_INPUTS_PATH = RESULTS_DIR / ".fig15_cache.inputs"
+_HAS_PYARROW = find_spec("pyarrow") is not None
+
+SHELL_DIRS = {
+    "shell_host": RESULTS_DIR / "fig15_shell_host",
+    "shell_docker": RESULTS_DIR / "fig15_shell_docker",
+}
+
+# The benchstats line is printed last: shell output files are read from the
+# end, in windows of this many bytes (doubled until the line is found)
+_BENCHSTATS_MARKER = b"benchstats:"
+_TAIL_WINDOW_BYTES = 8192
+
+# Below this many shell result files, starting worker processes costs more
+# than parsing the files one after the other
+PARALLEL_PARSE_MIN_FILES = 256
+
+
+def _fig15_csvs() -> List[Path]:
+    """List the benchkit campaign CSVs of Figure 15 (one scandir pass, no sort)."""
+    if not RESULTS_DIR.is_dir():
+        return []
+    return [
+        p
+        for p in find_files(RESULTS_DIR, suffix=".csv", max_depth=0)
+        if p.name.startswith("benchmark_") and "fig15" in p.name
+    ]
 
-def _collect_benchkit_csvs() -> pd.DataFrame:
+
+def _collect_benchkit_csvs(csv_files: List[Path]) -> List[dict]:
     """
-    Find the last benchkit campaign CSV for host and docker, parse with get_dataframe,
-    and return a unified DataFrame with columns: run_type, nb_threads, throughput.
+    Take the last benchkit campaign CSV for host and docker, parse with read_campaign_csv,
+    and return its runs as records with the keys run_type, nb_threads and throughput.
     """
-    csv_files = sorted(RESULTS_DIR.glob("benchmark_*fig15*.csv"))
-
-    # Keep the last CSV per category (sorted by name includes timestamp)
+    # Keep the last CSV per category (the name ends with the campaign timestamp)
     last_per_type: dict[str, Path] = {}
     for p in csv_files:
         if "docker" in p.name:
-            last_per_type["benchkit_docker"] = p
+            run_type = "benchkit_docker"
         elif "host" in p.name:
-            last_per_type["benchkit_host"] = p
+            run_type = "benchkit_host"
+        else:
+            continue
+        if run_type not in last_per_type or p.name > last_per_type[run_type].name:
+            last_per_type[run_type] = p
 
-    frames = []
+    records = []
     for run_type, csv_path in last_per_type.items():
-        df = get_dataframe(csv_path)
-        df["run_type"] = run_type
-        frames.append(df[["run_type", "nb_threads", "throughput"]])
+        df = read_campaign_csv(csv_path)
+        records.extend(
+            {"run_type": run_type, "nb_threads": nb_threads, "throughput": throughput}
+            for nb_threads, throughput in zip(df["nb_threads"], df["throughput"])
+        )
+
+    return records
+
+
+def _read_benchstats(path: Path) -> Optional[str]:
+    """
+    Return what follows the last benchstats marker of a file, or None.
 
-    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+    The file is scanned backwards from its end, so that only the tail holding
+    the benchstats line is read and decoded, whatever the size of the file.
+    """
+    with path.open("rb") as f:
+        size = f.seek(0, 2)
+        window = _TAIL_WINDOW_BYTES
+        while True:
+            start = max(size - window, 0)
+            f.seek(start)
+            tail = f.read()
+            _, marker, benchstats = tail.rpartition(_BENCHSTATS_MARKER)
+            if marker:
+                return benchstats.decode("utf-8", errors="replace")
+            if start == 0:
+                return None
+            window *= 2
 
 
 def _parse_shell_file(path: Path) -> dict:
@@ -79,16 +156,14 @@ def _parse_shell_file(path: Path) -> dict:
     We build a minimal CollectContext-like shim so we can reuse the same
     parsing that benchkit uses internally.
     """
-    output = path.read_text()
-
     # bench = LevelDBBench()
     # Reproduce the collect() parsing inline since we don't have a real
-    # CollectContext. The parsing only needs the stdout string.
-
-    if "benchstats:" not in output:
+    # CollectContext. The parsing only needs the benchstats line of stdout.
+    benchstats = _read_benchstats(path)
+    if benchstats is None:
         raise ValueError(f"Missing benchstats line in {path}")
 
-    benchstats = output.split("benchstats:")[-1].strip()
+    benchstats = benchstats.strip()
     values = benchstats.split(";")
     nb_threads = len(values) - 2
 
@@ -103,38 +178,84 @@ def _parse_shell_file(path: Path) -> dict:
     }
 
 
-def _collect_shell_results(dirname: str, run_type: str) -> pd.DataFrame:
-    """Parse all shell result files from a directory."""
-    shell_dir = RESULTS_DIR / dirname
+def _try_parse_shell_file(path: Path) -> Optional[dict]:
+    """Parse a shell output file, warning about (and skipping) unparsable ones."""
+    try:
+        return _parse_shell_file(path)
+    except Exception as e:
+        print(f"WARNING: skipping {path.name}: {e}")
+        return None
+
+
+def _shell_files(shell_dir: Path) -> List[Path]:
+    return sorted(shell_dir.glob("run_t*_r*.txt"))
+
+
+def _collect_shell_results(shell_dir: Path, run_type: str) -> List[dict]:
+    """
+    Parse all shell result files from a directory.
+
+    Large result directories are parsed by a pool of worker processes (the
+    files are independent, and parsing them is pure Python).
+    """
     if not shell_dir.exists():
-        return pd.DataFrame()
+        return []
+
+    txt_files = _shell_files(shell_dir)
+    if len(txt_files) < PARALLEL_PARSE_MIN_FILES:
+        parsed = [_try_parse_shell_file(txt_file) for txt_file in txt_files]
+    else:
+        with ProcessPoolExecutor() as executor:
+            parsed = list(executor.map(_try_parse_shell_file, txt_files, chunksize=16))
+
+    return [{**rec, "run_type": run_type} for rec in parsed if rec is not None]
+
+
+def _collect_results() -> pd.DataFrame:
+    """
+    Collect the runs of all sources into one DataFrame (run_type, nb_threads, throughput).
+
+    The DataFrame is cached in CACHE_PATH and reloaded as long as the input
+    files (campaign CSVs, shell output files and shell directories) are the
+    ones it was built from (listed in CACHE_INPUTS_PATH) and none of them is
+    newer, so that re-plotting does not parse the inputs again. Adding or
+    deleting an input file invalidates the cache.
+    """
+    csv_files = _fig15_csvs()
+    inputs = list(csv_files)
+    for shell_dir in SHELL_DIRS.values():
+        if shell_dir.exists():
+            inputs += [shell_dir, *_shell_files(shell_dir)]
+    inputs_key = "\n".join(sorted(str(p) for p in inputs))
 
-    rows = []
-    for txt_file in sorted(shell_dir.glob("run_t*_r*.txt")):
-        try:
-            rec = _parse_shell_file(txt_file)
-            rec["run_type"] = run_type
-            rows.append(rec)
-        except Exception as e:
-            print(f"WARNING: skipping {txt_file.name}: {e}")
+    if _HAS_PYARROW and inputs and CACHE_PATH.is_file() and CACHE_INPUTS_PATH.is_file():
+        same_inputs = CACHE_INPUTS_PATH.read_text() == inputs_key
+        if same_inputs and CACHE_PATH.stat().st_mtime >= max(p.stat().st_mtime for p in inputs):
+            return pd.read_parquet(CACHE_PATH)
 
-    return pd.DataFrame(rows) if rows else pd.DataFrame()
+    records = _collect_benchkit_csvs(csv_files)
+    for run_type, shell_dir in SHELL_DIRS.items():
+        records += _collect_shell_results(shell_dir, run_type)
+    df = pd.DataFrame.from_records(records, columns=["run_type", "nb_threads", "throughput"])
+
+    if _HAS_PYARROW and not df.empty:
+        df.to_parquet(CACHE_PATH, compression="zstd", index=False)
+        CACHE_INPUTS_PATH.write_text(inputs_key)
+    return df
 
 
 def main():
     # --- Collect all data ---
-    dfs = [
-        _collect_benchkit_csvs(),
-        _collect_shell_results("fig15_shell_host", "shell_host"),
-        _collect_shell_results("fig15_shell_docker", "shell_docker"),
-    ]
-    df = pd.concat([d for d in dfs if not d.empty], ignore_index=True)
+    df = _collect_results()
 
     if df.empty:
         print("No data found in", RESULTS_DIR)
         return
 
-    print(df.to_string(index=False))
+    if SUMMARY:
+        print(summarize_runs(df, group_cols=["run_type", "nb_threads"], y="throughput").to_string())
+    else:
+        print(df.to_string(index=False))
     print()
 
     # --- Pretty labels + ordering ---
@@ -151,6 +272,15 @@ def main():
     thread_order = sorted(df["nb_threads"].unique())
 
     # --- Plot ---
+    # The plotting stack is only imported once there is something to plot
+    import matplotlib
+
+    if not INTERACTIVE:
+        matplotlib.use("Agg")
+
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
     sns.set_theme(
         context="talk",
         style="whitegrid",
@@ -195,28 +325,19 @@ def main():
     print(f"Saved: {out_pdf}")
     print(f"Saved: {out_png}")
 
-    # --- Overhead summary table ---
-    summary = (
-        df[df["run_type"].isin(present_types)]
-        .groupby(["run_type", "nb_threads"])
-        .agg(mean_throughput=("throughput", "mean"))
-        .reset_index()
-    )
-    pivot = summary.pivot(index="nb_threads", columns="run_type", values="mean_throughput")
+    # --- Overhead summary table (mean throughput per thread count and run type) ---
+    pivot = df.groupby(["nb_threads", "run_type"])["throughput"].mean().unstack("run_type")
 
-    if {"benchkit_host", "shell_host"}.issubset(pivot.columns):
-        pivot["host_overhead_%"] = (
-            100 * (pivot["benchkit_host"] - pivot["shell_host"]) / pivot["shell_host"]
-        )
-    if {"benchkit_docker", "shell_docker"}.issubset(pivot.columns):
-        pivot["docker_overhead_%"] = (
-            100 * (pivot["benchkit_docker"] - pivot["shell_docker"]) / pivot["shell_docker"]
-        )
+    for env in ("host", "docker"):
+        benchkit, shell = f"benchkit_{env}", f"shell_{env}"
+        if {benchkit, shell}.issubset(pivot.columns):
+            pivot[f"{env}_overhead_%"] = 100 * (pivot[benchkit] - pivot[shell]) / pivot[shell]
 
     print("\nOverhead summary:")
     print(pivot.to_string())
 
-    plt.show()
+    if INTERACTIVE:
+        plt.show()
 
 
 if __name__ == "__main__":
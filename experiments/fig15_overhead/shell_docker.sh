@@ -25,6 +25,9 @@
 #   cd experiments/fig15_overhead/
 #   ./shell_docker.sh
 #
+#   # Pin to the same CPUs as the benchkit campaigns (see fig15_leveldb_overhead.py)
+#   PERFAID_FIG15_CPUS=0-7 ./shell_docker.sh
+#
 # After running, use plot_overhead.py to generate the comparison figure.
 
 set -e
@@ -61,6 +64,7 @@ echo "[docker] leveldb (ct):         $LEVELDB_SRC_CONT"
 echo "[docker] build (ct):           $BUILD_DIR_CONT"
 echo "[docker] db (ct):              $DB_DIR_CONT"
 echo "[docker] output (host):        $OUT_DIR"
+echo "[docker] cpus:                 ${PERFAID_FIG15_CPUS:-all}"
 
 run_in_docker() {
   # Run a single command string inside the container
@@ -69,6 +73,7 @@ run_in_docker() {
     --volume="$BENCHKIT_HOME_HOST":"$BENCHKIT_HOME_CONT" \
     --hostname=perfaid_overhead \
     --user=1000:1000 \
+    ${PERFAID_FIG15_CPUS:+--cpuset-cpus=$PERFAID_FIG15_CPUS} \
     "$IMAGE_NAME" \
     bash --login -c "$1"
 }
@@ -24,6 +24,9 @@
 #   cd experiments/fig15_overhead/
 #   ./shell_host.sh
 #
+#   # Pin to the same CPUs as the benchkit campaigns (see fig15_leveldb_overhead.py)
+#   PERFAID_FIG15_CPUS=0-7 ./shell_host.sh
+#
 # After running, use plot_overhead.py to generate the comparison figure.
 
 set -e
@@ -31,6 +34,13 @@ set -e
 NB_RUNS=10
 DURATION=10
 
+# Optional CPU list (e.g., "0-7") the benchmark is pinned to, shared with
+# fig15_leveldb_overhead.py and shell_docker.sh
+PIN=""
+if [ -n "${PERFAID_FIG15_CPUS:-}" ]; then
+  PIN="taskset -c $PERFAID_FIG15_CPUS"
+fi
+
 # Benchkit home on host (supports BENCHKIT_HOME override)
 BENCHKIT_HOME_HOST="${BENCHKIT_HOME:-$HOME/.benchkit}"
 
@@ -51,6 +61,7 @@ echo "[host] leveldb src:   $LEVELDB_SRC"
 echo "[host] build dir:     $BUILD_DIR"
 echo "[host] db dir:        $DB_DIR"
 echo "[host] output dir:    $OUT_DIR"
+echo "[host] cpus:          ${PERFAID_FIG15_CPUS:-all}"
 
 cd "$BUILD_DIR"
 
@@ -72,7 +83,7 @@ for threads in 2 4 8; do
     out_file="$OUT_DIR/run_t${threads}_r${rep}.txt"
     echo "[host] threads=$threads rep=$rep -> $out_file"
 
-    ./db_bench \
+    $PIN ./db_bench \
       --threads="$threads" \
       --benchmarks=readrandom \
       --use_existing_db=1 \
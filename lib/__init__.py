@@ -10,7 +10,8 @@ scripts, keeping the scripts concise and DRY.
 
 Modules:
     platforms   Platform detection: recognizes known servers (e.g., "algol" ->
-                Kunpeng 96-core NUMA) and falls back to auto-detection.
+                Kunpeng 96-core NUMA) and falls back to auto-detection; also
+                detects P-cores and E-cores on hybrid processors.
     locks       Lock library configuration: generates Tilt (libmutrep) shared
                 libraries for LD_PRELOAD-based pthread_mutex interposition.
                 Supports CAS, TTAS, Ticket, MCS, Hemlock (flat) and CNA, HMCS
@@ -23,31 +24,132 @@ Modules:
                 (used by fig07_locks.py and fig10_schedulers.py).
     flame       Flame graph utilities: post-run hooks for generating individual
                 and differential flame graphs from perf record data.
+    perfstat    Persistent perf stat: one system-wide ``perf stat -I`` process
+                per campaign, with hooks attributing intervals to runs.
+    files       File discovery: scandir-based search for result files (e.g.,
+                perf.folded) in campaign result trees.
+    affinity    CPU pinning hooks: apply the ``cpu_list`` campaign variable via
+                sched_setaffinity instead of a per-run ``taskset`` wrapper.
+    results     Campaign result loading: parses benchkit CSVs once and caches
+                them as Parquet, and draws the multi-panel figures (import as
+                ``lib.results``; pulls in pandas).
+    parallel    Concurrent campaigns: runs groups of campaigns whose runs do
+                not interfere (e.g., pinned to disjoint CPUs) at the same time.
+    noise       Background CPU load: pinned busy-loop processes replacing
+                stress-ng in the baseline variability experiment.
+    cli         Command-line helpers: SPEC ISO argument parsing and validation,
+                PERFAID_SWEEP thread sweep selection.
     lockgen/    Lock code generation: generates Tilt-compatible C wrappers from
                 libvsync spinlock headers and HMCS lock templates.
 
-Exported symbols (for ``from lib import ...``):
-    get_platform, get_tilt_lib, get_locks, LOCKS, PRETTY_LOCKS,
+Exported symbols (for ``from lib import ...``; loaded lazily on first access):
+    get_platform, detect_core_types, get_isolated_cpus, get_physical_cores,
+    parse_cpu_list,
+    get_tilt_lib, get_locks, LOCKS, PRETTY_LOCKS,
     get_scheduler, SCHEDULERS, PRETTY_SCHEDULERS,
-    Panel, flame_post_hook, generate_differential_flamegraph.
+    Panel, flame_post_hook, fetch_flamegraph_tools, FlameStyle,
+    generate_differential_flamegraph, generate_differential_flamegraphs,
+    find_files,
+    AffinityPin, run_campaigns_concurrently,
+    parse_spec_iso_arg, get_thread_sweep, cpu_noise, PerfStatInterval.
 """
 
-from .flame import flame_post_hook, generate_differential_flamegraph
-from .locks import LOCKS, PRETTY_LOCKS, get_locks, get_tilt_lib
-from .panels import Panel
-from .platforms import get_platform
-from .schedulers import PRETTY_SCHEDULERS, SCHEDULERS, get_scheduler
+import importlib
+from typing import TYPE_CHECKING, Any, List
+
+if TYPE_CHECKING:
+    from .affinity import AffinityPin
+    from .cli import get_thread_sweep, parse_spec_iso_arg
+    from .files import find_files
+    from .flame import (
+        FlameStyle,
+        fetch_flamegraph_tools,
+        flame_post_hook,
+        generate_differential_flamegraph,
+        generate_differential_flamegraphs,
+    )
+    from .locks import LOCKS, PRETTY_LOCKS, get_locks, get_tilt_lib
+    from .noise import cpu_noise
+    from .panels import Panel
+    from .parallel import run_campaigns_concurrently
+    from .perfstat import PerfStatInterval
+    from .platforms import (
+        detect_core_types,
+        get_isolated_cpus,
+        get_physical_cores,
+        get_platform,
+        parse_cpu_list,
+    )
+    from .schedulers import PRETTY_SCHEDULERS, SCHEDULERS, get_scheduler
+
+# Exported symbol -> submodule defining it. Submodules are only imported on
+# first access (PEP 562), so e.g. fig08_sched_hooks.py does not load the perf,
+# Tilt and campaign machinery it never uses.
+_EXPORTS = {
+    "AffinityPin": "affinity",
+    "parse_spec_iso_arg": "cli",
+    "get_thread_sweep": "cli",
+    "find_files": "files",
+    "fetch_flamegraph_tools": "flame",
+    "FlameStyle": "flame",
+    "flame_post_hook": "flame",
+    "generate_differential_flamegraph": "flame",
+    "generate_differential_flamegraphs": "flame",
+    "LOCKS": "locks",
+    "PRETTY_LOCKS": "locks",
+    "get_locks": "locks",
+    "get_tilt_lib": "locks",
+    "cpu_noise": "noise",
+    "Panel": "panels",
+    "run_campaigns_concurrently": "parallel",
+    "PerfStatInterval": "perfstat",
+    "detect_core_types": "platforms",
+    "get_isolated_cpus": "platforms",
+    "get_physical_cores": "platforms",
+    "parse_cpu_list": "platforms",
+    "get_platform": "platforms",
+    "PRETTY_SCHEDULERS": "schedulers",
+    "SCHEDULERS": "schedulers",
+    "get_scheduler": "schedulers",
+}
 
 __all__ = [
     "flame_post_hook",
+    "fetch_flamegraph_tools",
+    "FlameStyle",
+    "find_files",
     "generate_differential_flamegraph",
+    "generate_differential_flamegraphs",
     "get_locks",
     "get_tilt_lib",
     "LOCKS",
     "PRETTY_LOCKS",
     "get_platform",
+    "detect_core_types",
+    "get_isolated_cpus",
+    "get_physical_cores",
+    "parse_cpu_list",
     "get_scheduler",
     "Panel",
+    "AffinityPin",
+    "run_campaigns_concurrently",
+    "parse_spec_iso_arg",
+    "get_thread_sweep",
+    "cpu_noise",
+    "PerfStatInterval",
     "SCHEDULERS",
     "PRETTY_SCHEDULERS",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    globals()[name] = value  # next accesses bypass __getattr__
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,136 @@
+# Copyright (C) 2024 Vrije Universiteit Brussel. All rights reserved.
+# SPDX-License-Identifier: MIT
+"""
+CPU pinning through affinity inheritance instead of a ``taskset`` wrapper.
+
+Paper reference:
+    Section 3.3 (Controlled Placement with taskset), Figure 4.
+
+``TasksetWrap`` prepends ``taskset --cpu-list ...`` to every benchmark
+invocation, which costs one extra ``execve`` per run. The CPU affinity mask
+is inherited across ``fork``/``exec``, so the same placement is obtained by
+calling ``sched_setaffinity`` on the campaign itself right before the
+benchmark is spawned, and restoring the previous mask right after.
+
+On Linux the affinity mask is per thread (``sched_setaffinity(0, ...)``
+targets the calling thread), so campaigns running concurrently in different
+threads (see ``lib/parallel.py``) each pin their own benchmark.
+
+Optionally (``bind_memory=True``), the memory of the benchmark is also bound
+to the NUMA nodes of the selected CPUs, as ``numactl --membind`` would do.
+The memory policy set by ``set_mempolicy(2)`` is per thread and inherited
+across ``fork``/``exec`` as well, so the same pre/post-run hooks apply it.
+
+Architecture:
+    AffinityPin provides two campaign hooks:
+
+    - **pin_hook** (pre-run): reads the ``cpu_list`` variable of the current
+      record and, if non-empty, restricts the calling thread to those CPUs.
+      An empty list (no pinning) leaves the affinity untouched.
+    - **unpin_hook** (post-run): restores the mask saved by ``pin_hook``.
+"""
+
+import ctypes
+import os
+import platform
+import threading
+from typing import List
+
+from benchkit.benchmark import PathType, RecordResult, WriteRecordFileFunction
+
+from lib.platforms import get_cpu_nodes
+
+# set_mempolicy(2) system call numbers (not wrapped by glibc)
+_SYS_SET_MEMPOLICY = {
+    "x86_64": 238,
+    "aarch64": 237,
+}
+_MPOL_DEFAULT = 0
+_MPOL_BIND = 2
+_NODEMASK_WORD_BITS = 8 * ctypes.sizeof(ctypes.c_ulong)
+
+
+def _set_mempolicy(mode: int, nodes: List[int]) -> None:
+    """Set the memory policy of the calling thread (inherited by its children)."""
+    nb_words = max(nodes, default=0) // _NODEMASK_WORD_BITS + 1
+    nodemask = (ctypes.c_ulong * nb_words)()
+    for node in nodes:
+        nodemask[node // _NODEMASK_WORD_BITS] |= 1 << (node % _NODEMASK_WORD_BITS)
+
+    libc = ctypes.CDLL(None, use_errno=True)
+    syscall_nr = _SYS_SET_MEMPOLICY[platform.machine()]
+    # The kernel reads maxnode - 1 bits of the node mask
+    maxnode = nb_words * _NODEMASK_WORD_BITS + 1
+    if libc.syscall(syscall_nr, mode, nodemask if nodes else None, maxnode if nodes else 0):
+        errno = ctypes.get_errno()
+        raise OSError(errno, f"set_mempolicy: {os.strerror(errno)}")
+
+
+class AffinityPin:
+    """
+    Pins benchmark runs to the ``cpu_list`` campaign variable.
+
+    This class provides pre-run and post-run hooks that replace
+    ``TasksetWrap`` in campaigns sweeping over CPU placements.
+
+    Args:
+        bind_memory: Also bind the memory of the benchmark to the NUMA nodes
+            of the selected CPUs (x86_64 and aarch64 only).
+    """
+
+    def __init__(self, bind_memory: bool = False) -> None:
+        self._bind_memory = bind_memory
+        self._saved = threading.local()
+
+    def pin_hook(
+        self,
+        build_variables: RecordResult,
+        run_variables: RecordResult,
+        other_variables: RecordResult,
+        record_data_dir: PathType,
+    ) -> None:
+        """
+        Pre-run hook restricting the calling thread to the selected CPUs.
+
+        The benchmark process spawned afterwards inherits the affinity mask
+        (and the memory policy, with ``bind_memory``).
+        """
+        assert build_variables or record_data_dir or True  # silence warning
+
+        self._saved.cpus = None
+        self._saved.membind = False
+
+        cpu_list = {**run_variables, **other_variables}.get("cpu_list")
+        if not cpu_list:
+            return
+
+        self._saved.cpus = os.sched_getaffinity(0)
+        os.sched_setaffinity(0, cpu_list)
+
+        nodes = get_cpu_nodes(cpu_list) if self._bind_memory else []
+        if nodes:
+            _set_mempolicy(_MPOL_BIND, nodes)
+            self._saved.membind = True
+
+    def unpin_hook(
+        self,
+        experiment_results_lines: List[RecordResult],
+        record_data_dir: PathType,
+        write_record_file_fun: WriteRecordFileFunction,
+    ) -> RecordResult:
+        """
+        Post-run hook restoring the affinity mask saved by the pre-run hook
+        (and the default memory policy, if memory was bound).
+        """
+        assert record_data_dir or write_record_file_fun  # silence warning
+
+        saved_cpus = getattr(self._saved, "cpus", None)
+        if saved_cpus is not None:
+            os.sched_setaffinity(0, saved_cpus)
+            self._saved.cpus = None
+
+        if getattr(self._saved, "membind", False):
+            _set_mempolicy(_MPOL_DEFAULT, [])
+            self._saved.membind = False
+
+        return experiment_results_lines[0]
@@ -0,0 +1,87 @@
+# Copyright (C) 2024 Vrije Universiteit Brussel. All rights reserved.
+# SPDX-License-Identifier: MIT
+"""
+Command-line helpers shared by the example and experiment scripts.
+
+The SPEC CPU 2017 scripts (fig02_spec.py, fig04_spec_placement.py,
+fig05_placement_spec.py) all take the path to the SPEC ISO image as their
+single positional argument and validate it the same way. The thread sweeps
+(fig07_locks.py, fig10_schedulers.py) are selected with the PERFAID_SWEEP
+environment variable.
+
+Key functions:
+    parse_spec_iso_arg()    Parse and validate the SPEC ISO path argument.
+    get_thread_sweep()      Thread counts of the sweep selected by PERFAID_SWEEP.
+"""
+
+import argparse
+import functools
+import os
+import sys
+from pathlib import Path
+from typing import List, Tuple
+
+# Thread counts per PERFAID_SWEEP value: the full sweep (values used for plot
+# generation in submission) and a geometric subset (see get_thread_sweep)
+THREAD_SWEEPS = {
+    "full": [1, 2, 4, 8, 16, 24, 32, 64, 72, 80, 88, 96],
+    "fast": [1, 4, 16, 32, 64, 96],
+}
+
+
+@functools.lru_cache(maxsize=None)
+def _parse_spec_iso(description: str, argv: Tuple[str, ...]) -> Path:
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument(
+        "spec_iso",
+        type=Path,
+        help="Path to the SPEC CPU 2017 ISO image (e.g., /path/to/cpu2017-1.1.9.iso)",
+    )
+    args = parser.parse_args(argv)
+
+    spec_iso = args.spec_iso.expanduser().resolve()
+    if not spec_iso.exists():
+        print(f"Error: SPEC ISO not found: {spec_iso}", file=sys.stderr)
+        sys.exit(1)
+
+    return spec_iso
+
+
+def parse_spec_iso_arg(description: str) -> Path:
+    """
+    Parse the SPEC CPU 2017 ISO path from the command line.
+
+    Exits with status 1 if the ISO image does not exist. The result is cached
+    per command line, so repeated calls do not parse or stat again.
+
+    Args:
+        description: Script description shown by ``--help``.
+
+    Returns:
+        Absolute path to the SPEC ISO image.
+    """
+    return _parse_spec_iso(description, tuple(sys.argv[1:]))
+
+
+def get_thread_sweep() -> List[int]:
+    """
+    Get the thread counts to sweep, selected by the PERFAID_SWEEP variable.
+
+    ``full`` is the 12-point sweep used for the paper. ``fast`` (the default)
+    keeps 6 geometrically spaced thread counts (1, 4, 16, 32, 64, 96): they
+    keep the shape of the curves (knee and saturation) in about half the
+    time; on machines with few cores, the full sweep keeps more of the low
+    thread counts.
+
+    Returns:
+        Thread counts, in increasing order (not yet bounded by the CPUs).
+
+    Raises:
+        ValueError: If PERFAID_SWEEP is set to an unknown sweep.
+    """
+    sweep = os.environ.get("PERFAID_SWEEP", "fast")
+    if sweep not in THREAD_SWEEPS:
+        raise ValueError(
+            f"Unknown PERFAID_SWEEP value: {sweep!r} (expected one of {', '.join(THREAD_SWEEPS)})"
+        )
+    return THREAD_SWEEPS[sweep]
@@ -0,0 +1,59 @@
+# Copyright (C) 2024 Vrije Universiteit Brussel. All rights reserved.
+# SPDX-License-Identifier: MIT
+"""
+File discovery in campaign result trees.
+
+Campaign result directories contain one sub-directory per run, and the
+scripts look for a few files in them afterwards (``perf.folded``, SVG flame
+graphs, CSV files). ``Path.rglob`` creates a Path object and matches a glob
+pattern for every entry it visits; ``find_files`` walks the tree with
+``os.scandir``, which returns the entry type along with the name, compares
+names as plain strings and only creates a Path for the matching files.
+
+Key function:
+    find_files()    Recursively list the files with a given name or suffix.
+"""
+
+import os
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple
+
+# Directories that never contain campaign results
+_SKIPPED_DIRS = frozenset({".git", "__pycache__", "FlameGraph"})
+
+
+def find_files(
+    root: Path,
+    name: Optional[str] = None,
+    suffix: Optional[str] = None,
+    max_depth: Optional[int] = None,
+) -> Iterator[Path]:
+    """
+    Recursively yield the files below ``root`` matching a name or a suffix.
+
+    Symbolic links are not followed. Results are yielded in directory order;
+    sort them if a stable order is needed.
+
+    Args:
+        root: Directory to search.
+        name: Exact file name to match (e.g., "perf.folded").
+        suffix: File name suffix to match (e.g., ".svg").
+        max_depth: Maximum directory depth below ``root`` to descend into
+            (0 = only ``root`` itself). Unlimited by default.
+
+    Returns:
+        Iterator over the paths of the matching files.
+    """
+    stack: List[Tuple[str, int]] = [(os.fspath(root), 0)]
+    while stack:
+        directory, depth = stack.pop()
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name not in _SKIPPED_DIRS and (max_depth is None or depth < max_depth):
+                        stack.append((entry.path, depth + 1))
+                elif entry.is_file(follow_symlinks=False):
+                    if (name is None or entry.name == name) and (
+                        suffix is None or entry.name.endswith(suffix)
+                    ):
+                        yield Path(entry.path)
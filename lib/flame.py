@@ -7,27 +7,47 @@ Paper reference:
     Section 4.4 (Visualizing Performance with Flame Graphs in perfaid),
     Figures 13 and 14.
 
-This module provides two helpers that wrap benchkit's PerfReportWrap
-functionality with artifact-specific defaults (title generation, sizing):
+This module provides helpers around benchkit's PerfReportWrap and Brendan
+Gregg's FlameGraph tools, with artifact-specific defaults (title generation,
+sizing):
 
     flame_post_hook()
         Returns a post-run hook function that generates an individual flame
         graph (SVG) for each benchmark run. The hook extracts metadata from
         the campaign record (lock name, thread count, scheduler, duration)
         to produce descriptive titles and subtitles on the flame graph.
+        When inferno is installed, the stacks are folded with ``perf script |
+        inferno-collapse-perf`` and rendered with inferno-flamegraph;
+        otherwise benchkit's PerfReportWrap pipeline (perf script,
+        stackcollapse-perf.pl, flamegraph.pl) is used.
 
     generate_differential_flamegraph()
         Takes two folded stack-trace files (produced by ``perf script |
         stackcollapse-perf.pl``) and generates a differential flame graph
         highlighting which functions gained (red) or lost (blue) relative
-        execution time between the two configurations.
+        execution time between the two configurations. The folded files are
+        joined in Python (as difffolded.pl does) and only rendered by
+        inferno-flamegraph if installed, flamegraph.pl otherwise.
 
-The default styling constants (width, height, font size, minimum-width
-threshold) are tuned for the paper's single-column figures.
+    fetch_flamegraph_tools()
+        Fetches Brendan Gregg's FlameGraph tools unless they are already
+        present.
+
+    generate_differential_flamegraphs()
+        Generates both differential flame graphs of a pair of folded files
+        (A against B and B against A), parsing each folded file only once.
+
+The styling (width, height, font size, minimum-width threshold) is passed as
+a single FlameStyle object, whose defaults are tuned for the paper's
+single-column figures.
 """
 
+import functools
+import shutil
+import subprocess
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional
+from typing import Dict, List, Optional
 
 from benchkit.benchmark import RecordResult, WriteRecordFileFunction
 from benchkit.commandwrappers.perf import PerfReportWrap
@@ -40,12 +60,49 @@ FLAMEGRAPH_FONTSIZE = 15
 FLAMEGRAPH_MINWIDTH = 2.0
 
 
+@dataclass(frozen=True, slots=True)
+class FlameStyle:
+    """
+    Styling of a rendered flame graph (defaults: the paper's single-column figures).
+
+    Attributes:
+        width: Width of the flame graph in pixels.
+        height: Height per stack frame in pixels.
+        fontsize: Font size for labels.
+        minwidth: Minimum width percentage to display a frame.
+    """
+
+    width: int = FLAMEGRAPH_WIDTH
+    height: int = FLAMEGRAPH_HEIGHT
+    fontsize: int = FLAMEGRAPH_FONTSIZE
+    minwidth: float = FLAMEGRAPH_MINWIDTH
+
+
+@functools.lru_cache(maxsize=None)
+def fetch_flamegraph_tools(perf_record: PerfReportWrap, flamegraph_dir: Path) -> None:
+    """
+    Fetch the FlameGraph tools used by ``perf_record``, unless already present.
+
+    ``PerfReportWrap.fetch_flamegraph()`` probes the remote repository even
+    when the tools have been fetched by an earlier run; this only calls it if
+    ``flamegraph.pl`` is missing, and at most once per process.
+
+    The SVG rendering done in this module uses the faster Rust port of the
+    tools, inferno, when ``inferno-flamegraph`` is on the PATH (install it
+    with ``cargo install inferno``).
+
+    Args:
+        perf_record: The PerfReportWrap instance configured with ``flamegraph_dir``.
+        flamegraph_dir: Directory where the FlameGraph tools are (to be) stored.
+    """
+    if not (flamegraph_dir / "flamegraph.pl").is_file():
+        perf_record.fetch_flamegraph()
+
+
 def flame_post_hook(
     perf_record: PerfReportWrap,
-    flamegraph_width: int = FLAMEGRAPH_WIDTH,
-    flamegraph_height: int = FLAMEGRAPH_HEIGHT,
-    flamegraph_fontsize: int = FLAMEGRAPH_FONTSIZE,
-    flamegraph_minwidth: float = FLAMEGRAPH_MINWIDTH,
+    style: FlameStyle = FlameStyle(),
+    folded_paths: Optional[List[Path]] = None,
 ):
     """
     Create a post-run hook that generates a flame graph for each run.
@@ -53,16 +110,26 @@ def flame_post_hook(
     This hook extracts metadata from the campaign record (lock name, thread
     count, scheduler, etc.) to generate descriptive flame graph titles.
 
+    If a ``folded_paths`` list is given, the hook appends the folded stack
+    file of each run to it (in run order), so that the caller does not have
+    to search the results tree for them afterwards.
+
     Args:
         perf_record: The PerfReportWrap instance used to record the run.
-        flamegraph_width: Width of the flame graph in pixels.
-        flamegraph_height: Height per stack frame in pixels.
-        flamegraph_fontsize: Font size for labels.
-        flamegraph_minwidth: Minimum width percentage to display a frame.
+        style: Styling of the flame graphs.
+        folded_paths: Optional list collecting the ``perf.folded`` file of
+            each run.
 
     Returns:
         A post-run hook function compatible with benchkit campaigns.
     """
+    # Styling arguments of post_run_hook_flamegraph, the same for every run
+    style_kwargs = {
+        "flamegraph_width": style.width,
+        "flamegraph_height": style.height,
+        "flamegraph_fontsize": style.fontsize,
+        "flamegraph_minwidth": style.minwidth,
+    }
 
     def hook(
         experiment_results_lines: list[RecordResult],
@@ -92,32 +159,45 @@ def flame_post_hook(
             f"{scheduler} scheduler"
         )
 
-        return perf_record.post_run_hook_flamegraph(
-            experiment_results_lines=experiment_results_lines,
-            record_data_dir=record_data_dir,
-            write_record_file_fun=write_record_file_fun,
-            flamegraph_title=flamegraph_title,
-            flamegraph_subtitle=flame_subtitle,
-            flamegraph_width=flamegraph_width,
-            flamegraph_height=flamegraph_height,
-            flamegraph_fontsize=flamegraph_fontsize,
-            flamegraph_minwidth=flamegraph_minwidth,
-        )
+        perf_data_path = Path(record_data_dir) / "perf.data"
+        folded_path = Path(record_data_dir) / "perf.folded"
+        if _has_inferno_pipeline() and perf_data_path.is_file():
+            _collapse_perf_data(perf_data_path=perf_data_path, folded_path=folded_path)
+            _render_flamegraph(
+                flamegraph_dir=None,
+                folded_path=folded_path,
+                out_svg_path=Path(record_data_dir) / "flamegraph.svg",
+                flamegraph_title=flamegraph_title,
+                flamegraph_subtitle=flame_subtitle,
+                style=style,
+            )
+            result: Optional[RecordResult] = record
+        else:
+            result = perf_record.post_run_hook_flamegraph(
+                experiment_results_lines=experiment_results_lines,
+                record_data_dir=record_data_dir,
+                write_record_file_fun=write_record_file_fun,
+                flamegraph_title=flamegraph_title,
+                flamegraph_subtitle=flame_subtitle,
+                **style_kwargs,
+            )
+
+        if folded_paths is not None and folded_path.is_file():
+            folded_paths.append(folded_path)
+
+        return result
 
     return hook
 
 
 def generate_differential_flamegraph(
-    perf_record: PerfReportWrap,
+    flamegraph_dir: Path,
     src_folded_path: Path,
     dst_folded_path: Path,
     out_svg_path: Path,
     flamegraph_title: str = "Differential Flame Graph",
     flamegraph_subtitle: str = "",
-    flamegraph_width: int = FLAMEGRAPH_WIDTH,
-    flamegraph_height: int = FLAMEGRAPH_HEIGHT,
-    flamegraph_fontsize: int = FLAMEGRAPH_FONTSIZE,
-    flamegraph_minwidth: float = FLAMEGRAPH_MINWIDTH,
+    style: FlameStyle = FlameStyle(),
 ) -> None:
     """
     Generate a differential flame graph comparing two runs.
@@ -126,26 +206,189 @@ def generate_differential_flamegraph(
     profiles. Red indicates functions that take more time in the destination
     profile, blue indicates functions that take less time.
 
+    The two folded files are joined in Python into the two-count format of
+    difffolded.pl (written next to the SVG, with a ``.folded`` suffix); only
+    the rendering is delegated to flamegraph.pl.
+
     Args:
-        perf_record: The PerfReportWrap instance (provides flamegraph tools path).
+        flamegraph_dir: Directory containing Brendan Gregg's FlameGraph tools.
         src_folded_path: Path to the source (baseline) folded stack file.
         dst_folded_path: Path to the destination (comparison) folded stack file.
         out_svg_path: Path where the differential SVG will be written.
         flamegraph_title: Title for the flame graph.
         flamegraph_subtitle: Subtitle with additional context.
-        flamegraph_width: Width in pixels.
-        flamegraph_height: Height per frame in pixels.
-        flamegraph_fontsize: Font size for labels.
-        flamegraph_minwidth: Minimum width percentage to display.
+        style: Styling of the flame graph.
+    """
+    _generate_differential_flamegraph(
+        flamegraph_dir=flamegraph_dir,
+        src_counts=_load_folded(src_folded_path),
+        dst_counts=_load_folded(dst_folded_path),
+        out_svg_path=out_svg_path,
+        flamegraph_title=flamegraph_title,
+        flamegraph_subtitle=flamegraph_subtitle,
+        style=style,
+    )
+
+
+def _load_folded(folded_path: Path) -> Dict[str, int]:
+    """Parse a folded stack file into a mapping from stack to sample count."""
+    counts: Dict[str, int] = {}
+    with open(folded_path) as folded_file:
+        for line in folded_file:
+            stack, _, count = line.rstrip("\n").rpartition(" ")
+            if stack:
+                counts[stack] = counts.get(stack, 0) + int(count)
+    return counts
+
+
+def _write_diff_folded(
+    src_counts: Dict[str, int],
+    dst_counts: Dict[str, int],
+    out_folded_path: Path,
+) -> None:
+    """Write the two-count folded format (``stack src dst``) of difffolded.pl."""
+    with open(out_folded_path, "w") as out_file:
+        for stack in sorted(src_counts.keys() | dst_counts.keys()):
+            out_file.write(f"{stack} {src_counts.get(stack, 0)} {dst_counts.get(stack, 0)}\n")
+
+
+@functools.lru_cache(maxsize=None)
+def _which_inferno(tool: str) -> Optional[str]:
+    """Locate an inferno tool (drop-in replacement of a FlameGraph script) on the PATH."""
+    return shutil.which(tool)
+
+
+def _has_inferno_pipeline() -> bool:
+    """Whether inferno replacements of stackcollapse-perf.pl and flamegraph.pl are installed."""
+    return bool(_which_inferno("inferno-collapse-perf") and _which_inferno("inferno-flamegraph"))
+
+
+def _collapse_perf_data(perf_data_path: Path, folded_path: Path) -> None:
+    """
+    Fold the stacks of a perf.data file with ``perf script | inferno-collapse-perf``.
+
+    ``perf script`` runs with the same (default) options as in benchkit's
+    stackcollapse-perf.pl pipeline, so that the folded stacks, including the
+    inlined frames, do not depend on which tools are installed.
+    """
+    with open(folded_path, "w") as out_file:
+        perf_script = subprocess.Popen(
+            ["perf", "script", "-i", str(perf_data_path)],
+            stdout=subprocess.PIPE,
+        )
+        assert perf_script.stdout is not None  # silence warning
+        collapse = subprocess.run(
+            [_which_inferno("inferno-collapse-perf")],
+            stdin=perf_script.stdout,
+            stdout=out_file,
+        )
+        perf_script.stdout.close()
+        if perf_script.wait() or collapse.returncode:
+            raise subprocess.CalledProcessError(
+                perf_script.returncode or collapse.returncode,
+                f"perf script -i {perf_data_path} | inferno-collapse-perf",
+            )
+
+
+def _render_flamegraph(
+    flamegraph_dir: Optional[Path],
+    folded_path: Path,
+    out_svg_path: Path,
+    flamegraph_title: str,
+    flamegraph_subtitle: str,
+    style: FlameStyle,
+) -> None:
+    """
+    Render a (differential) folded file into an SVG with inferno or flamegraph.pl.
+
+    ``flamegraph_dir`` may only be None if inferno-flamegraph is installed.
     """
-    perf_record.differential_flamegraph(
-        src_folded_path=src_folded_path,
-        dst_folded_path=dst_folded_path,
+    renderer = _which_inferno("inferno-flamegraph")
+    if renderer is None:
+        assert flamegraph_dir is not None
+        renderer = str(flamegraph_dir / "flamegraph.pl")
+    command = [
+        renderer,
+        f"--title={flamegraph_title}",
+        f"--subtitle={flamegraph_subtitle}",
+        f"--width={style.width}",
+        f"--height={style.height}",
+        f"--fontsize={style.fontsize}",
+        f"--minwidth={style.minwidth}",
+    ]
+    with open(folded_path) as in_file, open(out_svg_path, "w") as out_file:
+        subprocess.run(command, stdin=in_file, stdout=out_file, check=True)
+
+
+def _generate_differential_flamegraph(
+    flamegraph_dir: Path,
+    src_counts: Dict[str, int],
+    dst_counts: Dict[str, int],
+    out_svg_path: Path,
+    flamegraph_title: str,
+    flamegraph_subtitle: str,
+    style: FlameStyle,
+) -> None:
+    diff_folded_path = out_svg_path.with_suffix(".folded")
+    _write_diff_folded(
+        src_counts=src_counts,
+        dst_counts=dst_counts,
+        out_folded_path=diff_folded_path,
+    )
+    _render_flamegraph(
+        flamegraph_dir=flamegraph_dir,
+        folded_path=diff_folded_path,
         out_svg_path=out_svg_path,
         flamegraph_title=flamegraph_title,
         flamegraph_subtitle=flamegraph_subtitle,
-        flamegraph_width=flamegraph_width,
-        flamegraph_height=flamegraph_height,
-        flamegraph_fontsize=flamegraph_fontsize,
-        flamegraph_minwidth=flamegraph_minwidth,
+        style=style,
     )
+
+
+def generate_differential_flamegraphs(
+    flamegraph_dir: Path,
+    a_folded_path: Path,
+    b_folded_path: Path,
+    a_vs_b_svg_path: Path,
+    b_vs_a_svg_path: Path,
+    a_vs_b_subtitle: str = "",
+    b_vs_a_subtitle: str = "",
+    flamegraph_title: str = "Differential Flame Graph",
+    style: FlameStyle = FlameStyle(),
+) -> None:
+    """
+    Generate the differential flame graphs of A against B and of B against A.
+
+    Calling ``generate_differential_flamegraph`` twice with swapped inputs
+    parses both folded files twice. Here, each folded file is parsed once
+    into a stack -> count mapping, from which both two-count folded files
+    (written next to the SVGs, with a ``.folded`` suffix) are produced
+    before being rendered by flamegraph.pl.
+
+    Args:
+        flamegraph_dir: Directory containing Brendan Gregg's FlameGraph tools.
+        a_folded_path: Path to the folded stack file of configuration A.
+        b_folded_path: Path to the folded stack file of configuration B.
+        a_vs_b_svg_path: Output SVG with A as source and B as destination.
+        b_vs_a_svg_path: Output SVG with B as source and A as destination.
+        a_vs_b_subtitle: Subtitle of the A against B flame graph.
+        b_vs_a_subtitle: Subtitle of the B against A flame graph.
+        flamegraph_title: Title for both flame graphs.
+        style: Styling of both flame graphs.
+    """
+    a_counts = _load_folded(a_folded_path)
+    b_counts = _load_folded(b_folded_path)
+
+    for src_counts, dst_counts, out_svg_path, subtitle in (
+        (a_counts, b_counts, a_vs_b_svg_path, a_vs_b_subtitle),
+        (b_counts, a_counts, b_vs_a_svg_path, b_vs_a_subtitle),
+    ):
+        _generate_differential_flamegraph(
+            flamegraph_dir=flamegraph_dir,
+            src_counts=src_counts,
+            dst_counts=dst_counts,
+            out_svg_path=out_svg_path,
+            flamegraph_title=flamegraph_title,
+            flamegraph_subtitle=subtitle,
+            style=style,
+        )
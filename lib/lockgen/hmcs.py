@@ -20,7 +20,7 @@ The generation process:
 2. Computes ``#define`` directives for level sizes, thresholds, and the total
    number of lock nodes.
 3. Fills in the ``template_hmcs.h`` template and writes the result to
-   ``generatedlocks/include/``.
+   ``generatedlocks/include/`` (unless the header there is already identical).
 
 The resulting header is compiled by the CMakeLists.txt in ``generatedlocks/``
 and also ``#include``-d by the CNA lock (``locks/include/numa_cnalock.h``)
@@ -31,10 +31,9 @@ Key function:
 """
 
 from pathlib import Path
-from string import Template
 from typing import Tuple
 
-from .tiltgen import generate_tilt_file
+from .tiltgen import ensure_dir, generate_tilt_file, load_template, write_if_changed
 
 Lock = str
 
@@ -114,11 +113,11 @@ def generate_hmcs_lock(
     )
     h_thresholds_defines = get_h_thresholds_defines(h_thresholds=h_thresholds)
 
+    level_names = [f"LEVEL_{level_nb}" for level_nb in range(1, nb_levels + 1)]
+
     level_sizes = "\n".join(
-        f"#define LEVEL_{level_nb} {level_size}  /* {level_name} level */"
-        for level_nb, level_name, level_size in zip(
-            range(1, nb_levels + 1), nomenclatures[::-1], sizes[::-1]
-        )
+        f"#define {level} {level_size}  /* {level_name} level */"
+        for level, level_name, level_size in zip(level_names, nomenclatures[::-1], sizes[::-1])
     )
 
     nb_cpus = total_nb_cpus
@@ -135,26 +134,23 @@ def generate_hmcs_lock(
 
     thresholds_values = ["1"] + [f"H{i}" for i in range(1, nb_levels)]
     thresholds = "\n".join(
-        f"#define LEVEL_{i}_THRESHOLD {v}" for i, v in enumerate(thresholds_values, start=1)
+        f"#define {level}_THRESHOLD {v}" for level, v in zip(level_names, thresholds_values)
     )
 
     num_locks_sep = " + \\\n"
     indent = "    "
     num_locks = (
         num_locks_sep.join(
-            f"{indent}(" + " * ".join(f"LEVEL_{l2}" for l2 in range(1, l1 + 1)) + ")"
-            for l1 in range(nb_levels, 0, -1)
+            f"{indent}(" + " * ".join(level_names[:l1]) + ")" for l1 in range(nb_levels, 0, -1)
         )
         + " \\"
     )
 
-    level_spec = "\n".join(
-        f"{indent}{{LEVEL_{i}, LEVEL_{i}_THRESHOLD}}, \\" for i in range(1, nb_levels + 1)
-    )
+    level_spec = "\n".join(f"{indent}{{{level}, {level}_THRESHOLD}}, \\" for level in level_names)
 
     spinlock_dir = vsync_dir / "include" / "vsync" / "spinlock"
     hmcs_filecontent = (
-        Template(template_hmcs_file.read_text())
+        load_template(template_hmcs_file)
         .substitute(
             hierarchy_defines=hierarchy_defines,
             h_thresholds_defines=h_thresholds_defines,
@@ -173,8 +169,8 @@ def generate_hmcs_lock(
 
     hmcs_pathname = target_directory / f"{hmcs_spec}.h"
 
-    target_directory.mkdir(parents=True, exist_ok=True)
-    hmcs_pathname.write_text(hmcs_filecontent + "\n")
+    ensure_dir(target_directory)
+    write_if_changed(hmcs_pathname, hmcs_filecontent + "\n")
 
     return hmcs_spec
 
@@ -189,7 +185,7 @@ def main():
 
     generate_hmcs_lock(
         vsync_dir=vsync_dir,
-        hmcs_spec="hmcs-mcs-mcs-mcs-skp-mcs",
+        hmcs_spec=lock_name,
         target_directory=hmcs_gen_dir,
         nomenclature="core-cache-numa-system",
         sizes=(64, 32, 4, 1),
@@ -205,8 +201,6 @@ def main():
         ),
     )
 
-    Path(hmcs_gen_dir / "hmcs-mcs-mcs-mcs-skp-mcs.h").rename(hmcs_gen_dir / "numa_hmcslock.h")
-
     try:
         generate_tilt_file(
             lock_name=lock_name,
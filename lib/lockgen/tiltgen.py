@@ -24,16 +24,82 @@ The generated files are then compiled by the CMakeLists.txt in
 into the final ``libmutrep.so``.
 
 Key functions:
+    load_template()             Parse a template file (cached per process).
+    ensure_dir()                Create an output directory if it does not exist.
+    write_if_changed()          Write a generated file unless it is already up to date.
     get_context_info()          Analyze a lock header and return its API properties.
     generate_tilt_file()        Generate one C wrapper for a given lock.
     generate_all_vsync_locks()  Generate wrappers for all locks in libvsync.
     generate_locks_from_dir()   Generate wrappers for locks in an arbitrary directory.
 """
 
+import functools
 import re
 from pathlib import Path
 from string import Template
-from typing import List
+from typing import Dict, List
+
+_TEMPLATE_DIR = Path(__file__).parent
+
+# Lock API functions looked for in a lock header
+_LOCK_FUNCTIONS = ("acquire", "tryacquire", "node_init", "destroy")
+
+# Definition of any of these functions (e.g., "static inline void\nmcslock_acquire(...)"),
+# capturing the function suffix and the parameters
+_LOCK_FUNCTION_RE = re.compile(
+    r"^\s*static\s+.*?\s+\w+_(" + "|".join(_LOCK_FUNCTIONS) + r")\s*\(\s*([^\)]*?)\)",
+    re.MULTILINE,
+)
+
+
+@functools.lru_cache(maxsize=None)
+def load_template(template_path: Path) -> Template:
+    """
+    Read and parse a template file, once per process.
+
+    The templates are constant, so every lock generated in a process reuses
+    the same parsed Template instead of re-reading the file.
+    """
+    return Template(template_path.read_text())
+
+
+@functools.lru_cache(maxsize=None)
+def _context_tryacquire_impl(lock_name: str, context_type: str) -> str:
+    return (
+        load_template(_TEMPLATE_DIR / "template_context_trylock.c")
+        .substitute(LOCK=lock_name, CONTEXT_TYPE=context_type)
+        .rstrip()
+    )
+
+
+def ensure_dir(path: Path) -> None:
+    """
+    Create an output directory (and its parents) unless it already exists.
+
+    This is a single ``mkdir`` call, without a separate ``is_dir()`` check.
+    It is not cached: a directory removed while the process runs (e.g., by
+    a clean build) is created again for the next generated file.
+    """
+    path.mkdir(parents=True, exist_ok=True)
+
+
+def write_if_changed(path: Path, content: str) -> bool:
+    """
+    Write a generated file, leaving it untouched if it already has this content.
+
+    Keeping the modification time of unchanged files spares CMake from
+    rebuilding the lock libraries that depend on them.
+
+    Returns:
+        bool: True if the file was written, False if it was already up to date.
+    """
+    try:
+        if path.read_text() == content:
+            return False
+    except FileNotFoundError:
+        pass
+    path.write_text(content)
+    return True
 
 
 def get_context_info(lock_header_path: Path) -> (bool, str, bool, bool, bool):
@@ -56,30 +122,18 @@ def get_context_info(lock_header_path: Path) -> (bool, str, bool, bool, bool):
     with lock_header_path.open() as f:
         content = f.read()
 
-    # Regex patterns to match acquire, tryacquire, and destroy function signatures
-    acquire_pattern = re.compile(
-        r"^\s*static\s+.*?\s+\w+_acquire\s*\(\s*([^\)]*?)\)",  # Extract parameters
-        re.MULTILINE,
-    )
-    tryacquire_pattern = re.compile(
-        r"^\s*static\s+.*?\s+\w+_tryacquire\s*\(",  # Check for tryacquire function
-        re.MULTILINE,
-    )
-    node_init_pattern = re.compile(
-        r"^\s*static\s+.*?\s+\w+_node_init\s*\(",  # Check for node_init function
-        re.MULTILINE,
-    )
-    destroy_pattern = re.compile(
-        r"^\s*static\s+.*?\s+\w+_destroy\s*\(",  # Check for destroy function
-        re.MULTILINE,
-    )
+    # First definition of each lock function, with its parameters
+    functions: Dict[str, str] = {}
+    for match in _LOCK_FUNCTION_RE.finditer(content):
+        functions.setdefault(match.group(1), match.group(2))
+        if len(functions) == len(_LOCK_FUNCTIONS):
+            break
 
-    acquire_match = acquire_pattern.search(content)
-    if not acquire_match:
+    if "acquire" not in functions:
         raise ValueError(f"No acquire function found in {lock_header_path}")
 
     # Extract the parameters from the acquire function
-    parameters = acquire_match.group(1)
+    parameters = functions["acquire"]
 
     # Split the parameters by commas to check if there's more than one
     params = [param.strip() for param in parameters.split(",")]
@@ -95,13 +149,13 @@ def get_context_info(lock_header_path: Path) -> (bool, str, bool, bool, bool):
         context_type = context_param.split()[0]
 
     # Check if tryacquire function exists
-    tryacquire_exists = bool(tryacquire_pattern.search(content))
+    tryacquire_exists = "tryacquire" in functions
 
     # Check if node initialization is required
-    context_init_required = bool(node_init_pattern.search(content))
+    context_init_required = "node_init" in functions
 
     # Check if destroy function exists
-    destroy_exists = bool(destroy_pattern.search(content))
+    destroy_exists = "destroy" in functions
 
     return context_required, context_type, tryacquire_exists, context_init_required, destroy_exists
 
@@ -120,9 +174,8 @@ def generate_tilt_file(
         vsync_path (Path): Path to the `vsync` directory.
         output_dir (Path): Path to the directory where the generated file will be saved.
     """
-    template_contextfree_file = Path(__file__).parent / "template.c"
-    template_contextaware_file = Path(__file__).parent / "template_context.c"
-    template_contexttrylock_file = Path(__file__).parent / "template_context_trylock.c"
+    template_contextfree_file = _TEMPLATE_DIR / "template.c"
+    template_contextaware_file = _TEMPLATE_DIR / "template_context.c"
     output_file = output_dir / f"{lock_name}.c"
     lock_header_path = lock_header_dir / f"{lock_name}.h"
 
@@ -130,8 +183,7 @@ def generate_tilt_file(
     if not lock_header_path.is_file():
         raise FileNotFoundError(f"Lock header file not found: {lock_header_path}")
 
-    if not output_dir.is_dir():
-        output_dir.mkdir(parents=True)
+    ensure_dir(output_dir)
 
     # Determine lock properties
     requires_ctx, context_type, tryacquire_exists, context_init_required, destroy_exists = (
@@ -142,20 +194,13 @@ def generate_tilt_file(
     # Adjust the implementation of tryacquire
     if tryacquire_exists:
         if requires_ctx:
-            tryacquire_impl = (
-                Template(template_contexttrylock_file.read_text())
-                .substitute(
-                    LOCK=lock_name,
-                    CONTEXT_TYPE=context_type or "",
-                )
-                .rstrip()
-            )
+            tryacquire_impl = _context_tryacquire_impl(lock_name, context_type or "")
         else:
             tryacquire_impl = f"    return {lock_name}_tryacquire(&m->lock);"
     else:
         tryacquire_impl = (
             "    (void) m;\n"
-            '    fprintf(stderr, "Error: tryacquire not implemented for ${LOCK}\\n");\n'
+            f'    fprintf(stderr, "Error: tryacquire not implemented for {lock_name}\\n");\n'
             "    exit(EXIT_FAILURE);"
         )
 
@@ -165,9 +210,8 @@ def generate_tilt_file(
     # Adjust the lock implementation for destroy
     destroy_code = f"    {lock_name}_destroy(&m->lock);" if destroy_exists else "    (void) m;"
 
-    # Read the template
-    template_content = template_to_use.read_text()
-    template = Template(template_content)
+    # Get the (cached) template
+    template = load_template(template_to_use)
 
     # Substitute placeholders in the template
     content = template.substitute(
@@ -180,9 +224,11 @@ def generate_tilt_file(
     )
 
     # Write the generated file
-    output_file.write_text(content)
     context_type_msg = "context-aware" if requires_ctx else "context-free"
-    print(f"Generated tilt file for {context_type_msg} lock: {output_file}")
+    if write_if_changed(output_file, content):
+        print(f"Generated tilt file for {context_type_msg} lock: {output_file}")
+    else:
+        print(f"Tilt file for {context_type_msg} lock is up to date: {output_file}")
 
 
 def generate_all_vsync_locks(
@@ -207,7 +253,7 @@ def generate_all_vsync_locks(
         try:
             generate_tilt_file(
                 lock_name=lock_name,
-                lock_header_dir=vsync_dir / "include" / "vsync" / "spinlock",
+                lock_header_dir=spinlock_dir,
                 output_dir=output_dir,
                 include_path="vsync/spinlock",
             )
@@ -32,12 +32,15 @@ Supported lock algorithms:
         glibc pthread_mutex (when lock="default"; no LD_PRELOAD)
 
 Key functions:
-    get_locks()         Returns the list of all available lock names.
+    get_locks()         Returns the names of all available locks.
     get_tilt_lib()      Builds and returns a TiltLib instance ready for use
                         as a ``shared_libs`` entry in benchkit campaigns.
 """
 
+import functools
+import itertools
 import pathlib
+from dataclasses import dataclass
 from typing import List, Tuple
 
 from benchkit.platforms import Platform
@@ -73,8 +76,14 @@ _OTHER_LOCKS = {
     ],
 }
 
+# HMCS hierarchy (nomenclature, thresholds) per architecture
+_ARCH_HMCS = {
+    "x86_64": ("core-numa-system", (128, 128)),
+    "aarch64": ("cache-numa-system", (128, 128)),
+}
+
 # All locks available for experiments
-LOCKS = _VSYNC_LOCKS + sum(_OTHER_LOCKS.values(), start=[]) + ["default"]
+LOCKS = tuple(itertools.chain(_VSYNC_LOCKS, *_OTHER_LOCKS.values(), ("default",)))
 
 # Pretty names for plotting
 PRETTY_LOCKS = {
@@ -90,62 +99,81 @@ PRETTY_LOCKS = {
 }
 
 
-def get_locks() -> List[str]:
+def get_locks() -> Tuple[str, ...]:
     """
-    Get the list of all available lock implementations.
+    Get the lock implementations available for experiments.
 
     Returns:
-        List of lock names that can be used in experiments.
+        Tuple of lock names that can be used in experiments (immutable, so
+        shared rather than copied; convert it to a list to modify it).
+    """
+    return LOCKS
+
+
+@dataclass(frozen=True)
+class _Topology:
+    """Topology counts of a platform, as used by the HMCS generation."""
+
+    nb_cpus: int
+    nb_cores: int
+    nb_cache_partitions: int
+    nb_numa_nodes: int
+    nb_packages: int
+
+
+@functools.lru_cache(maxsize=None)
+def _get_topology(platform: Platform) -> _Topology:
+    """
+    Query the topology of the platform, each count once per process.
+
+    The topology of a machine does not change while a script runs, so every
+    tilt library built in the process (e.g., with different lock lists)
+    reuses the same counts.
     """
-    return LOCKS.copy()
+    return _Topology(
+        nb_cpus=platform.nb_cpus(),
+        nb_cores=platform.nb_hyperthreaded_cores(),
+        nb_cache_partitions=platform.nb_cache_partitions(),
+        nb_numa_nodes=platform.nb_numa_nodes(),
+        nb_packages=platform.nb_packages(),
+    )
 
 
-def _get_full_nomenc_size(platform: Platform) -> Tuple[Tuple[str, int], ...]:
+def _get_full_nomenc_size(topology: _Topology) -> Tuple[Tuple[str, int], ...]:
     """Get full nomenclature with sizes for HMCS generation."""
     return (
-        ("core", platform.nb_hyperthreaded_cores()),
-        ("cache", platform.nb_cache_partitions()),
-        ("numa", platform.nb_numa_nodes()),
-        ("package", platform.nb_packages()),
+        ("core", topology.nb_cores),
+        ("cache", topology.nb_cache_partitions),
+        ("numa", topology.nb_numa_nodes),
+        ("package", topology.nb_packages),
         ("system", 1),
     )
 
 
 def _generate_numa_locks(
-    platform: Platform,
+    architecture: str,
+    topology: _Topology,
     gen_include_dir: pathlib.Path,
 ) -> None:
-    """Generate NUMA-aware HMCS locks for the given platform."""
-    match platform.architecture:
-        case "x86_64":
-            nomenclature = "core-numa-system"
-            sizes = (
-                platform.nb_hyperthreaded_cores(),
-                platform.nb_numa_nodes(),
-                1,
-            )
-            thresholds = (128, 128)
-        case "aarch64":
-            nomenclature = "cache-numa-system"
-            sizes = (
-                platform.nb_cache_partitions(),
-                platform.nb_numa_nodes(),
-                1,
-            )
-            thresholds = (128, 128)
-        case _:
-            raise ValueError(f"Unsupported architecture: {platform.architecture}")
+    """Generate NUMA-aware HMCS locks for the given platform topology."""
+    full_nomenc_size = _get_full_nomenc_size(topology=topology)
+    level_size = dict(full_nomenc_size)
+
+    try:
+        nomenclature, thresholds = _ARCH_HMCS[architecture]
+    except KeyError:
+        raise ValueError(f"Unsupported architecture: {architecture}") from None
 
     generate_hmcs_lock(
         vsync_dir=_vsync_dir,
         hmcs_spec="numa_hmcslock",
         target_directory=gen_include_dir,
         nomenclature=nomenclature,
-        sizes=sizes,
+        sizes=tuple(level_size[level] for level in nomenclature.split("-")),
         h_thresholds=thresholds,
-        total_nb_cpus=platform.nb_cpus(),
-        total_nb_cores=platform.nb_hyperthreaded_cores(),
-        full_nomenc_size=_get_full_nomenc_size(platform=platform),
+        total_nb_cpus=topology.nb_cpus,
+        total_nb_cores=topology.nb_cores,
+        full_nomenc_size=full_nomenc_size,
     )
 
 
@@ -167,8 +195,23 @@ def get_tilt_lib(
         debug: Whether to build in debug mode.
 
     Returns:
-        TiltLib instance ready for use as a shared_lib in campaigns.
+        TiltLib instance ready for use as a shared_lib in campaigns. Instances
+        are cached per (platform, locks, debug), so the locks are generated
+        and the library is built once per process.
     """
+    return _get_tilt_lib(
+        platform=platform,
+        locks=None if locks is None else tuple(locks),
+        debug=debug,
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def _get_tilt_lib(
+    platform: Platform,
+    locks: Tuple[str, ...] | None,
+    debug: bool,
+) -> TiltLib:
     if locks is None:
         vsync_locks = _VSYNC_LOCKS
         dir2locks = _OTHER_LOCKS
@@ -183,7 +226,8 @@ def get_tilt_lib(
 
     # Generate NUMA-aware locks for this platform
     _generate_numa_locks(
-        platform=platform,
+        architecture=platform.architecture,
+        topology=_get_topology(platform=platform),
         gen_include_dir=gen_include_dir,
     )
 
@@ -0,0 +1,59 @@
+# Copyright (C) 2024 Vrije Universiteit Brussel. All rights reserved.
+# SPDX-License-Identifier: MIT
+"""
+Deterministic background CPU load.
+
+Paper reference:
+    Section 3.1 (Benchmark Setup and Baseline Experiment), Figure 2.
+
+The baseline variability experiment runs the benchmark next to a background
+load that competes for CPUs. This module provides that load without relying
+on ``stress-ng``, whose work profile depends on its version and build: one
+process per selected CPU, pinned with ``sched_setaffinity``, spins on the
+same modular-squaring loop for as long as the load is active.
+
+Processes (rather than threads) are used so that the burners do not
+serialize on the Python GIL.
+
+Key function:
+    cpu_noise()     Context manager running the background load on given CPUs.
+"""
+
+import contextlib
+import multiprocessing
+import os
+from typing import Iterable, Iterator
+
+# Mersenne prime modulus for the burner loop
+_NOISE_MODULUS = 2**31 - 1
+
+
+def _burn(cpu: int) -> None:
+    os.sched_setaffinity(0, {cpu})
+    x = cpu + 2
+    while True:
+        x = x * x % _NOISE_MODULUS
+
+
+@contextlib.contextmanager
+def cpu_noise(cpus: Iterable[int]) -> Iterator[None]:
+    """
+    Keep the given CPUs busy for the duration of the ``with`` block.
+
+    Args:
+        cpus: CPU ids to load, one burner process per CPU.
+    """
+    burners = [
+        multiprocessing.Process(target=_burn, args=(cpu,), name=f"cpu-noise-{cpu}", daemon=True)
+        for cpu in cpus
+    ]
+    for burner in burners:
+        burner.start()
+
+    try:
+        yield
+    finally:
+        for burner in burners:
+            burner.terminate()
+        for burner in burners:
+            burner.join()
@@ -21,7 +21,7 @@ from typing import Any, Iterable
 from benchkit.core.benchmark import Benchmark
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Panel:
     """
     A single panel in a multi-panel experiment figure.
@@ -31,6 +31,9 @@ class Panel:
         campaign_name: Name used for benchkit output directories and CSV files.
         bench: The benchkit Benchmark instance to run.
         parameter_space: Dictionary mapping variable names to their values.
+
+    Panels are frozen against attribute reassignment but, since the parameter
+    space is a dict, they are not hashable and cannot be set members or keys.
     """
 
     name: str
@@ -0,0 +1,52 @@
+# Copyright (C) 2024 Vrije Universiteit Brussel. All rights reserved.
+# SPDX-License-Identifier: MIT
+"""
+Concurrent execution of independent campaigns.
+
+Paper reference:
+    Figures 5 (right), 7 and 15.
+
+Campaigns whose runs do not compete for the same resources (e.g., pinned to
+disjoint CPUs) can execute at the same time while the rest of the machine
+would otherwise idle. All callers make this opt-in:
+    experiments/fig05_heater.py                         NB_WORKERS > 1
+    experiments/fig07_locks.py                          CONCURRENT_PANELS
+    experiments/fig15_overhead/fig15_leveldb_overhead.py CONCURRENT_CAMPAIGNS
+
+Each campaign keeps its own name, hence its own results directory and CSV
+file: no result merging is needed afterwards. Campaigns sharing a benchmark
+build directory or database must not be in the same group; the caller runs
+a first group with a single campaign that builds the benchmark before the
+concurrent groups start.
+
+Key functions:
+    run_campaigns_concurrently()    Run groups of campaigns, one group at a
+                                    time, campaigns within a group in parallel.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Sequence
+
+from benchkit.campaign import Campaign
+
+
+def run_campaigns_concurrently(campaign_groups: Sequence[Sequence[Campaign]]) -> None:
+    """
+    Run groups of campaigns: groups sequentially, campaigns in a group concurrently.
+
+    Campaigns spend their time waiting on benchmark subprocesses, so a thread
+    per campaign is enough to overlap them. Any exception raised by a campaign
+    is re-raised once its group has completed.
+
+    Args:
+        campaign_groups: Groups of campaigns whose runs do not interfere.
+    """
+    for group in campaign_groups:
+        if len(group) == 1:
+            group[0].run()
+            continue
+
+        with ThreadPoolExecutor(max_workers=len(group)) as executor:
+            futures = [executor.submit(campaign.run) for campaign in group]
+        for future in futures:
+            future.result()
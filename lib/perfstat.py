@@ -0,0 +1,188 @@
+# Copyright (C) 2024 Vrije Universiteit Brussel. All rights reserved.
+# SPDX-License-Identifier: MIT
+"""
+Persistent, system-wide ``perf stat`` in interval mode.
+
+Paper reference:
+    Section 4.3 (Using perf for Profiling and Run-Time Statistics), Figure 12.
+
+``PerfStatWrap`` prepends ``perf stat`` to every benchmark invocation, so each
+run pays the perf start-up and ``perf_event_open`` set-up of all counters.
+This module provides an alternative where a single ``perf stat -I`` process
+counts system-wide (``-a``) for the whole campaign, printing the counts every
+interval; each run gets the sum of the intervals that elapsed while it ran.
+
+Because counting is system-wide, the counts also include the activity of the
+rest of the machine (e.g., the schedkit daemon) during the run, and the run
+boundaries are only known to the interval granularity. Run times are mapped
+to perf's own interval timestamps, anchored on the first interval perf
+prints (so the perf start-up delay does not shift the run boundaries).
+
+Architecture:
+    PerfStatInterval provides two campaign hooks:
+
+    - **start_hook** (pre-run): starts ``perf stat`` on first use, waits
+      for its first interval, and marks the start of the run.
+    - **update_results_hook** (post-run): waits until perf has written an
+      interval ending after the run, then sums the intervals that ended
+      during the run and adds them to the record as ``perf-stat/<event>``
+      fields (the names used by ``PerfStatWrap``). Counts of the same event
+      on different PMUs (hybrid cores) are aggregated.
+
+    close() stops perf once the campaign is done and removes the temporary
+    output file, if one was created.
+"""
+
+import shutil
+import subprocess
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from benchkit.benchmark import PathType, RecordResult, WriteRecordFileFunction
+
+# Period at which the perf stat output file is polled for new intervals, in seconds
+_POLL_PERIOD_S = 0.005
+
+
+class PerfStatInterval:
+    """
+    Counts events with one system-wide ``perf stat -I`` process per campaign.
+
+    Args:
+        events: perf event names (e.g., ["context-switches", "cache-misses"]).
+        interval_ms: Printing interval of perf stat, in milliseconds.
+        output_path: File perf stat writes the intervals to. Defaults to a
+            temporary file.
+    """
+
+    def __init__(
+        self,
+        events: List[str],
+        interval_ms: int = 100,
+        output_path: Optional[Path] = None,
+    ) -> None:
+        self._events = events
+        self._interval_ms = interval_ms
+        self._tmp_dir: Optional[Path] = None
+        if output_path is None:
+            self._tmp_dir = Path(tempfile.mkdtemp(prefix="perfstat-"))
+            output_path = self._tmp_dir / "perf_stream.csv"
+        self._output_path = output_path
+        self._process: Optional[subprocess.Popen] = None
+        self._perf_start = 0.0
+        self._run_start = 0.0
+
+    def start_hook(
+        self,
+        build_variables: RecordResult,
+        run_variables: RecordResult,
+        other_variables: RecordResult,
+        record_data_dir: PathType,
+    ) -> None:
+        """
+        Pre-run hook starting perf stat (first run only) and marking the run start.
+        """
+        assert build_variables or run_variables or other_variables or True  # silence warning
+        assert record_data_dir or True  # silence warning
+
+        if self._process is None:
+            self._process = subprocess.Popen(
+                [
+                    "perf",
+                    "stat",
+                    "-I",
+                    str(self._interval_ms),
+                    "-x",
+                    ";",
+                    "-a",
+                    "-e",
+                    ",".join(self._events),
+                    "-o",
+                    str(self._output_path),
+                ],
+                stdout=subprocess.DEVNULL,
+            )
+            # perf timestamps count from when the counters were enabled: anchor
+            # on the first interval, as soon as perf has written it
+            first_timestamp = self._wait_for_interval(end=0.0)
+            self._perf_start = time.monotonic() - first_timestamp
+
+        self._run_start = time.monotonic() - self._perf_start
+
+    def update_results_hook(
+        self,
+        experiment_results_lines: List[RecordResult],
+        record_data_dir: PathType,
+        write_record_file_fun: WriteRecordFileFunction,
+    ) -> RecordResult:
+        """
+        Post-run hook adding the counts of the intervals ending during the run.
+        """
+        assert record_data_dir or write_record_file_fun  # silence warning
+
+        run_end = time.monotonic() - self._perf_start
+        # Wait for perf to print (and flush) the interval containing the end of the run
+        self._wait_for_interval(end=run_end)
+
+        counts = self._read_counts(start=self._run_start, end=run_end)
+        return {**experiment_results_lines[0], **counts}
+
+    def _wait_for_interval(self, end: float) -> float:
+        """
+        Wait until perf has written an interval whose timestamp is past ``end``.
+
+        Returns the timestamp of the last interval written.
+        """
+        while True:
+            last_timestamp = self._read_last_timestamp()
+            if last_timestamp > end:
+                return last_timestamp
+            returncode = self._process.poll()
+            if returncode is not None:
+                raise subprocess.CalledProcessError(returncode, self._process.args)
+            time.sleep(_POLL_PERIOD_S)
+
+    def _read_last_timestamp(self) -> float:
+        last_timestamp = 0.0
+        if not self._output_path.is_file():
+            return last_timestamp
+        with open(self._output_path) as output_file:
+            for line in output_file:
+                if not line.strip() or line.startswith("#"):
+                    continue
+                if not line.endswith("\n"):  # line still being written
+                    break
+                last_timestamp = float(line.split(";", 1)[0])
+        return last_timestamp
+
+    def _read_counts(self, start: float, end: float) -> Dict[str, float]:
+        counts = {f"perf-stat/{event}": 0.0 for event in self._events}
+        with open(self._output_path) as output_file:
+            for line in output_file:
+                if not line.strip() or line.startswith("#"):
+                    continue
+                timestamp, value, _, event = line.split(";")[:4]
+                if not start < float(timestamp) <= end:
+                    continue
+                if value.startswith("<"):  # <not counted> / <not supported>
+                    continue
+                # "cpu_core/cache-misses/" and "cpu_atom/cache-misses/" -> "cache-misses"
+                event = event.rstrip("/").rsplit("/", 1)[-1]
+                key = f"perf-stat/{event}"
+                if key in counts:
+                    counts[key] += float(value)
+        return counts
+
+    def close(self) -> None:
+        """
+        Stop perf stat (if it was started) and remove the temporary output file.
+        """
+        if self._process is not None:
+            self._process.terminate()
+            self._process.wait()
+            self._process = None
+        if self._tmp_dir is not None:
+            shutil.rmtree(self._tmp_dir, ignore_errors=True)
+            self._tmp_dir = None
@@ -15,8 +15,21 @@ For any other hostname, ``get_current_platform()`` from benchkit is used,
 which auto-detects the CPU topology (core count, NUMA layout, cache
 structure) from the local machine. This allows all scripts to run on
 arbitrary hardware without manual configuration.
+
+On hybrid-core processors, ``detect_core_types()`` splits the CPUs into
+performance (P) and efficiency (E) cores from sysfs, so that placement
+experiments do not need hand-written core lists. ``get_isolated_cpus()``
+reports the CPUs removed from the general scheduler (``isolcpus=``), and
+``get_physical_cores()`` groups SMT sibling CPUs by physical core;
+``get_cpu_nodes()`` maps CPUs to their NUMA nodes. ``parse_cpu_list()``
+reads the kernel CPU list format (e.g., "0-3,12-15"), also accepted by
+``taskset -c`` and ``docker run --cpuset-cpus``.
 """
 
+import functools
+from pathlib import Path
+from typing import Dict, List, Tuple
+
 from benchkit.communication import LocalCommLayer
 from benchkit.platforms import Platform, get_current_platform
 from benchkit.platforms.servers import Taishan200Kunpeng9204826x2
@@ -28,12 +41,14 @@ _KNOWN_PLATFORMS = {
 }
 
 
+@functools.lru_cache(maxsize=None)
 def get_platform() -> Platform:
     """
     Get the platform for the current machine.
 
     Returns a specialized Platform instance for known machines (e.g., NUMA servers),
-    or auto-detects the platform for unknown machines.
+    or auto-detects the platform for unknown machines. The machine is probed
+    once per process: later calls return the same (shared) instance.
 
     Returns:
         Platform instance configured for the current machine.
@@ -46,3 +61,118 @@ def get_platform() -> Platform:
         return platform
 
     return get_current_platform()
+
+
+_SYSFS_CPU_DIR = Path("/sys/devices/system/cpu")
+
+# Minimum ratio between the fastest and slowest CPU capacity to consider cores asymmetric
+_HYBRID_MIN_RATIO = 1.1
+
+
+def parse_cpu_list(cpu_list: str) -> List[int]:
+    """Parse a kernel CPU list (e.g., "0-3,12-15") into a list of CPU ids."""
+    cpus = []
+    for part in cpu_list.strip().split(","):
+        if not part:
+            continue
+        first, _, last = part.partition("-")
+        cpus.extend(range(int(first), int(last or first) + 1))
+    return cpus
+
+
+def get_isolated_cpus() -> List[int]:
+    """
+    Get the CPUs isolated from the general scheduler (``isolcpus=`` boot option).
+
+    Returns:
+        Sorted list of isolated CPU ids (empty if none are isolated).
+    """
+    return parse_cpu_list((_SYSFS_CPU_DIR / "isolated").read_text())
+
+
+def get_physical_cores() -> List[List[int]]:
+    """
+    Group the online CPUs by physical core (SMT siblings together).
+
+    Returns:
+        One sorted list of sibling CPU ids per physical core, ordered by their
+        lowest CPU id.
+    """
+    online = parse_cpu_list((_SYSFS_CPU_DIR / "online").read_text())
+    cores = set()
+    for cpu in online:
+        siblings_path = _SYSFS_CPU_DIR / f"cpu{cpu}" / "topology/thread_siblings_list"
+        cores.add(tuple(parse_cpu_list(siblings_path.read_text())))
+    return sorted(list(core) for core in cores)
+
+
+def get_cpu_nodes(cpus: List[int]) -> List[int]:
+    """
+    Get the NUMA nodes the given CPUs belong to.
+
+    Args:
+        cpus: CPU ids.
+
+    Returns:
+        Sorted list of the NUMA node ids of these CPUs.
+    """
+    nodes = set()
+    for cpu in cpus:
+        for node_dir in (_SYSFS_CPU_DIR / f"cpu{cpu}").glob("node[0-9]*"):
+            nodes.add(int(node_dir.name.removeprefix("node")))
+    return sorted(nodes)
+
+
+def _read_cpu_capacities() -> Dict[int, int]:
+    """Read the scheduler capacity of each online CPU (equal capacities if not exposed)."""
+    online = parse_cpu_list((_SYSFS_CPU_DIR / "online").read_text())
+    paths = {cpu: _SYSFS_CPU_DIR / f"cpu{cpu}" / "cpu_capacity" for cpu in online}
+    if all(path.is_file() for path in paths.values()):
+        return {cpu: int(path.read_text()) for cpu, path in paths.items()}
+    return {cpu: 1 for cpu in online}
+
+
+def detect_core_types() -> Tuple[List[int], List[int]]:
+    """
+    Detect the performance (P) and efficiency (E) cores of the current machine.
+
+    Only sources that describe the core type itself are trusted:
+
+    - On Intel hybrid processors, the kernel exposes the core type reported
+      by CPUID leaf 0x1A through the ``cpu_core`` and ``cpu_atom`` PMU
+      devices, whose CPU lists are used directly.
+    - Otherwise, the scheduler's ``cpu_capacity`` of each CPU is used (arm64,
+      and x86 hybrid parts since Linux 6.12). CPUs are split at the largest
+      gap between capacity values; CPUs above the gap are P-cores. A median
+      split would misclassify machines with fewer P-cores than E-cores
+      (e.g., 8 P + 16 E threads on the paper's laptop).
+
+    ACPI CPPC ``highest_perf`` and the maximum frequency are not used: AMD
+    processors with preferred-core ranking report different values for the
+    identical cores of a homogeneous CPU, which a gap split would turn into
+    bogus P/E sets.
+
+    On the paper's AMD Ryzen AI 9 HX 370, this yields P = 0-3,12-15 and
+    E = 4-11,16-23. The scripts compute P_CORES, E_CORES once at import; if
+    the result does not match the plateaus measured by fig03_heater.py /
+    fig05_heater.py, override these constants in the script.
+
+    Returns:
+        (p_cores, e_cores): sorted CPU ids. On homogeneous machines (or when
+        no core type information is exposed), all CPUs are reported as
+        P-cores and the E-core list is empty.
+    """
+    core_cpus = Path("/sys/devices/cpu_core/cpus")
+    atom_cpus = Path("/sys/devices/cpu_atom/cpus")
+    if core_cpus.is_file() and atom_cpus.is_file():
+        return parse_cpu_list(core_cpus.read_text()), parse_cpu_list(atom_cpus.read_text())
+
+    capacities = _read_cpu_capacities()
+    levels = sorted(set(capacities.values()))
+    if levels[-1] < _HYBRID_MIN_RATIO * levels[0]:
+        return sorted(capacities), []
+
+    _, threshold = max((hi - lo, hi) for lo, hi in zip(levels, levels[1:]))
+    p_cores = sorted(cpu for cpu, capacity in capacities.items() if capacity >= threshold)
+    e_cores = sorted(cpu for cpu, capacity in capacities.items() if capacity < threshold)
+    return p_cores, e_cores
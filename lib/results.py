@@ -0,0 +1,206 @@
+# Copyright (C) 2024 Vrije Universiteit Brussel. All rights reserved.
+# SPDX-License-Identifier: MIT
+"""
+Campaign result loading with a columnar (Parquet) cache.
+
+benchkit writes the results of a campaign as a CSV file whose first lines
+are comments describing the campaign. Parsing that text again every time a
+plot is regenerated re-does the same string-to-number conversions. This
+module parses each CSV once and stores the resulting DataFrame in a Parquet
+file next to it (``<csv>.parquet``, zstd-compressed), which is then read
+directly as long as it is not older than the CSV.
+
+Parquet support requires the optional ``pyarrow`` package; without it, the
+CSV is parsed on every call, as before.
+
+The multi-panel figures (Figures 7 and 10) are drawn from a single DataFrame
+holding the results of all panels, on one shared matplotlib figure, instead
+of one ``generate_graph`` call (and one figure) per panel.
+
+Key functions:
+    read_campaign_csv()     Load a benchkit campaign CSV as a DataFrame.
+    summarize_runs()        Reduce repeated runs to per-configuration statistics.
+    plot_panels()           Draw a multi-panel line-plot figure from campaigns.
+"""
+
+from importlib.util import find_spec
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+import pandas as pd
+from benchkit.campaign import Campaign, CampaignSuite
+from benchkit.charts.dataframes import get_dataframe
+
+from lib.files import find_files
+from lib.panels import Panel
+
+RESULTS_DIR = Path.home() / ".benchkit" / "results"
+
+_HAS_PYARROW = find_spec("pyarrow") is not None
+
+
+def _parquet_path(csv_path: Path) -> Path:
+    return csv_path.with_name(f"{csv_path.name}.parquet")
+
+
+def read_campaign_csv(csv_path: Path) -> pd.DataFrame:
+    """
+    Load a benchkit campaign CSV, going through the Parquet cache when possible.
+
+    Args:
+        csv_path: Path to the CSV file produced by a benchkit campaign.
+
+    Returns:
+        DataFrame with one row per benchmark run.
+    """
+    if not _HAS_PYARROW:
+        return get_dataframe(csv_path)
+
+    parquet_path = _parquet_path(csv_path)
+    if parquet_path.is_file() and parquet_path.stat().st_mtime >= csv_path.stat().st_mtime:
+        return pd.read_parquet(parquet_path)
+
+    df = get_dataframe(csv_path)
+    df.to_parquet(parquet_path, compression="zstd", index=False)
+    return df
+
+
+def summarize_runs(df: pd.DataFrame, group_cols: List[str], y: str) -> pd.DataFrame:
+    """
+    Reduce the repeated runs of each configuration to their median and spread.
+
+    The reduction is a single vectorized ``groupby().agg`` rather than a
+    Python loop over rows.
+
+    Args:
+        df: One row per benchmark run.
+        group_cols: Columns identifying a configuration (e.g., ["nb_threads"]).
+        y: Measured column to summarize (e.g., "throughput").
+
+    Returns:
+        DataFrame with the group columns and the columns nb_runs, median and
+        std of ``y``, one row per configuration.
+    """
+    return df.groupby(group_cols, as_index=False).agg(
+        nb_runs=(y, "size"),
+        median=(y, "median"),
+        std=(y, "std"),
+    )
+
+
+def campaign_csv_path(campaign: Campaign) -> Optional[Path]:
+    """
+    Find the results CSV of a campaign that has run.
+
+    benchkit names the CSV file like the campaign data directory, with a
+    ``.csv`` suffix. If that file is not there, the CSVs next to the data
+    directory sharing its name, or inside it, are looked up with
+    ``find_files`` and the last one by name is taken (names end with the
+    campaign timestamp), as for the Figure 15 CSVs.
+
+    Returns:
+        Path to the CSV file, or None if the campaign has no CSV file.
+    """
+    data_dir = Path(campaign.base_data_dir())
+    csv_path = data_dir.with_name(f"{data_dir.name}.csv")
+    if csv_path.is_file():
+        return csv_path
+
+    candidates: List[Path] = []
+    if data_dir.parent.is_dir():
+        candidates.extend(
+            p
+            for p in find_files(data_dir.parent, suffix=".csv", max_depth=0)
+            if p.name.startswith(data_dir.name)
+        )
+    if data_dir.is_dir():
+        candidates.extend(find_files(data_dir, suffix=".csv"))
+    return max(candidates, key=lambda p: p.name, default=None)
+
+
+def plot_panels(
+    panels: Sequence[Panel],
+    panel_campaigns: Sequence[Sequence[Campaign]],
+    x: str,
+    y: str,
+    hue: str,
+    pretty_hue: Dict[str, str],
+    title: str,
+    file_name: str,
+) -> None:
+    """
+    Draw one line plot per panel, side by side, in a single figure.
+
+    The results of all campaigns are loaded once into one DataFrame (with a
+    ``panel`` column), and all panels are drawn on the axes of a single
+    ``plt.subplots`` grid sharing one seaborn theme and one legend. If the
+    CSV file of a campaign cannot be found, each panel is plotted on its own
+    with ``CampaignSuite.generate_graph`` instead.
+
+    Args:
+        panels: The panels of the figure, in display order.
+        panel_campaigns: For each panel, the campaigns holding its results.
+        x: Column on the x-axis (e.g., "nb_threads").
+        y: Column on the y-axis (e.g., "throughput").
+        hue: Column distinguishing the lines (e.g., "lock").
+        pretty_hue: Display names of the ``hue`` values.
+        title: Title of the whole figure.
+        file_name: Base name of the PDF/PNG files written to RESULTS_DIR.
+    """
+    csv_paths = [
+        [campaign_csv_path(campaign) for campaign in campaigns] for campaigns in panel_campaigns
+    ]
+    if any(csv_path is None for paths in csv_paths for csv_path in paths):
+        # Without the CSV files, let benchkit draw one figure per panel
+        print("Campaign CSV files not found, plotting each panel with generate_graph")
+        for panel, campaigns in zip(panels, panel_campaigns):
+            CampaignSuite(campaigns=campaigns).generate_graph(
+                plot_name="lineplot",
+                x=x,
+                y=y,
+                hue=hue,
+                title=f"{title} - {panel.name}",
+            )
+        return
+
+    # Imported here so that loading results does not pull in the plotting stack
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
+    df = pd.concat(
+        [
+            read_campaign_csv(csv_path).assign(panel=panel.name)
+            for panel, paths in zip(panels, csv_paths)
+            for csv_path in paths
+            if csv_path is not None
+        ],
+        ignore_index=True,
+    )
+    df[hue] = df[hue].map(lambda value: pretty_hue.get(value, value))
+    hue_order = sorted(df[hue].unique())
+
+    sns.set_theme(style="whitegrid", palette="colorblind")
+    fig, axes = plt.subplots(1, len(panels), figsize=(5 * len(panels), 4), squeeze=False)
+
+    for ax, panel in zip(axes[0], panels):
+        sns.lineplot(
+            data=df[df["panel"] == panel.name],
+            x=x,
+            y=y,
+            hue=hue,
+            hue_order=hue_order,
+            marker="o",
+            legend=ax is axes[0][-1],
+            ax=ax,
+        )
+        ax.set_title(panel.name)
+
+    sns.move_legend(axes[0][-1], "upper left", bbox_to_anchor=(1, 1))
+    fig.suptitle(title)
+    fig.tight_layout()
+
+    for suffix in ("pdf", "png"):
+        out_path = RESULTS_DIR / f"{file_name}.{suffix}"
+        fig.savefig(out_path, dpi=150)
+        print(f"Saved: {out_path}")
+    plt.close(fig)
@@ -13,11 +13,13 @@ execution according to a chosen placement policy.
 Architecture:
     SchedProcess manages the daemon lifecycle via two campaign hooks:
 
-    - **start_sched_hook** (pre-run): reads the ``scheduler`` variable from
-      the current campaign record, computes the CPU ordering for the selected
+    - **start_sched_hook** (pre-run): cleans up after the daemon of the
+      previous run (if any), reads the ``scheduler`` variable from the
+      current campaign record, computes the CPU ordering for the selected
       policy, and launches the schedkit daemon in the background.
     - **end_sched_hook** (post-run): terminates the daemon so no residual
-      state persists across runs.
+      state persists across runs. With ``reuse_daemon``, the daemon is
+      instead kept for the next run if that run selects the same policy.
 
     Because the hooks receive the campaign variables automatically, scheduling
     policies become ordinary run-time parameters that benchkit sweeps over in
@@ -38,18 +40,22 @@ Key functions:
                         can be passed directly to campaign hooks.
 """
 
+import atexit
+import functools
+import os
 from pathlib import Path
-from typing import List
+from typing import Dict, List, Tuple
 
-import psutil
 from benchkit.benchmark import PathType, RecordResult, WriteRecordFileFunction
 from benchkit.platforms import Platform
-from benchkit.shell.shellasync import shell_async
 from benchkit.utils.dir import gitmainrootdir
 
-_repo_dir = gitmainrootdir().resolve()
-_sched_dir = _repo_dir / "deps/schedkit"
-_venv_dir = _repo_dir / ".venv"
+
+@functools.lru_cache(maxsize=None)
+def _get_repo_dir() -> Path:
+    """Root of the repository, looked up with git on first use only."""
+    return gitmainrootdir().resolve()
+
 
 # Available scheduling policies
 SCHEDULERS = [
@@ -61,6 +67,15 @@ SCHEDULERS = [
     "SAS",
 ]
 
+_SCHEDULERS_SET = frozenset(SCHEDULERS)
+
+# Policies following a CPU order computed from the platform topology, with
+# the provided_order argument of Platform.cpu_order() giving that order
+_POLICY_CPU_ORDER = {
+    "CLOSE": "desc",
+    "FAR": "even",
+}
+
 # Pretty names for plotting
 PRETTY_SCHEDULERS = {
     "Normal": "Default Linux Scheduler",
@@ -72,6 +87,19 @@ PRETTY_SCHEDULERS = {
 }
 
 
+def _get_filter_options(process_filter: List[str]) -> List[str]:
+    """
+    Get the --filter option of schedkit for process names (none if empty).
+
+    Duplicate names are dropped (keeping the first occurrence), since schedkit
+    would only test them again for every thread at every interval.
+    """
+    if not process_filter:
+        return []
+    process_filter_str = ",".join(dict.fromkeys(map(str, process_filter)))
+    return [f"--filter={process_filter_str}"]
+
+
 class SchedProcess:
     """
     Manages the schedkit (UserPlace) scheduling daemon.
@@ -86,6 +114,9 @@ class SchedProcess:
         process_filter: List[str],
         interval_seconds: float | None = 0.2,
         cpu_percentage: float | None = 0.00,
+        capture_logs: bool = True,
+        housekeeping_cpu: int | None = None,
+        reuse_daemon: bool = False,
     ) -> None:
         """
         Initialize the scheduler process manager.
@@ -95,73 +126,127 @@ class SchedProcess:
             process_filter: List of process names to manage (e.g., ["db_bench"]).
             interval_seconds: Scheduling interval in seconds.
             cpu_percentage: CPU usage threshold for considering a thread "active".
+            capture_logs: Write the output of the daemon to schedkit.out and
+                schedkit.err in the record data directory of each run. When
+                False, the output is discarded (sent to /dev/null), so that
+                the daemon does no disk I/O next to the benchmark.
+            housekeeping_cpu: CPU to pin the daemon itself to (with taskset),
+                so that its periodic wake-ups do not migrate onto the CPUs of
+                the benchmark. None leaves the daemon unpinned.
+            reuse_daemon: Keep the daemon running after a run, and reuse it
+                if the next run selects the same policy (e.g., in a sweep
+                over thread counts). The daemon then carries its state over
+                between runs and keeps writing to the logs of the run that
+                started it. It is stopped when the policy changes, by close(),
+                or at interpreter exit.
         """
         self.platform = platform
         self._process_filter = [str(p) for p in process_filter]
         self._interval_seconds = interval_seconds
         self._cpu_percentage = cpu_percentage
+        self._capture_logs = capture_logs
+        self._housekeeping_cpu = housekeeping_cpu
+        self._reuse_daemon = reuse_daemon
 
         self.process = None
+        # Policy run by the current daemon, if any
+        self._daemon_scheduler = None
+        # Whether a daemon may have run since the last cleanup (unknown at first)
+        self._dirty = True
         self._schedkit_stdout_filename = None
         self._schedkit_stderr_filename = None
-        self._python_path = _venv_dir / "bin/python3" if _venv_dir.is_dir() else "python3"
-
-    def _get_command_head(self) -> List[str]:
-        return [f"{self._python_path}", "schedkit.py"]
+        self._cpu_orders: Dict[str, List[int]] = {}
+        repo_dir = _get_repo_dir()
+        venv_dir = repo_dir / ".venv"
+        self._sched_dir = repo_dir / "deps/schedkit"
+        self._python_path = venv_dir / "bin/python3" if venv_dir.is_dir() else "python3"
+        self._command_head = (f"{self._python_path}", "schedkit.py")
+
+        # Options of "schedkit.py run" that are the same for every run
+        self._filter_options = _get_filter_options(self._process_filter)
+        self._run_options = []
+        if interval_seconds is not None:
+            self._run_options.append(f"--interval={interval_seconds}")
+        if cpu_percentage is not None:
+            self._run_options.append(f"--cpu-percentage={cpu_percentage}")
+
+        if reuse_daemon:
+            atexit.register(self.close)
 
     def _check_and_terminate_leftover_processes(self) -> None:
         """Check for and terminate any leftover schedkit processes."""
-        for proc in psutil.process_iter(attrs=["pid", "name", "cmdline"]):
+        # Imported here so that scripts not using schedkit never load psutil
+        import psutil
+
+        # Only the command line is needed to recognize schedkit; the pid is always known
+        leftovers = []
+        for proc in psutil.process_iter(attrs=["cmdline"]):
+            cmdline = proc.info["cmdline"]
+            if not cmdline or "schedkit.py" not in cmdline:
+                continue
             try:
-                if proc.info["cmdline"] and "schedkit.py" in proc.info["cmdline"]:
-                    pid = proc.info["pid"]
-                    print(f"Terminating leftover schedkit process with PID: {pid}")
-                    psutil.Process(pid).terminate()
-                    psutil.Process(pid).wait(timeout=5)
+                print(f"Terminating leftover schedkit process with PID: {proc.pid}")
+                proc.terminate()
+                leftovers.append(proc)
             except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
                 continue
 
+        # Wait for all of them at once, and kill the ones still alive after 5 s
+        _, alive = psutil.wait_procs(leftovers, timeout=5)
+        for proc in alive:
+            try:
+                proc.kill()
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                continue
+
     def cleanup(self) -> None:
         """Clean up any leftover scheduler processes."""
         self._check_and_terminate_leftover_processes()
 
-        command = self._get_command_head() + ["cleanup"]
+        command = [*self._command_head, "cleanup"]
         self.platform.comm.shell(
             command=command,
-            current_dir=_sched_dir,
+            current_dir=self._sched_dir,
         )
+        self._dirty = False
 
     def start(
         self,
         scheduler_name: str,
-        process_filter: List[str],
+        process_filter: List[str] | None,
         cpu_order: List[int],
         schedkit_stdout_filename: Path,
         schedkit_stderr_filename: Path,
     ) -> None:
-        """Start the scheduler daemon with the given configuration."""
-        command_head = self._get_command_head()
+        """
+        Start the scheduler daemon with the given configuration.
+
+        A process_filter of None uses the filter of this instance.
+        """
+        from benchkit.shell.shellasync import shell_async
 
         options = ["run", f"{scheduler_name}"]
-        if process_filter:
-            process_filter_str = ",".join(map(str, process_filter))
-            options.append(f"--filter={process_filter_str}")
-        if self._interval_seconds is not None:
-            options.append(f"--interval={self._interval_seconds}")
-        if self._cpu_percentage is not None:
-            options.append(f"--cpu-percentage={self._cpu_percentage}")
+        if process_filter is None:
+            options.extend(self._filter_options)
+        else:
+            options.extend(_get_filter_options(process_filter))
+        options.extend(self._run_options)
         if cpu_order:
             cpu_order_str = ",".join(map(str, cpu_order))
             options.append(f"--cpu-order={cpu_order_str}")
 
-        command = command_head + options
+        command = [*self._command_head, *options]
+        if self._housekeeping_cpu is not None:
+            command = ["taskset", "--cpu-list", f"{self._housekeeping_cpu}"] + command
 
+        self._dirty = True
+        self._daemon_scheduler = scheduler_name
         self.process = shell_async(
             command=command,
             stdout_path=schedkit_stdout_filename,
             stderr_path=schedkit_stderr_filename,
             platform=self.platform,
-            current_dir=_sched_dir,
+            current_dir=self._sched_dir,
         )
         rc = self.process.premature_exitcode()
         if rc is not None:
@@ -186,6 +271,39 @@ class SchedProcess:
             self.process.kill()
             self.process = None
 
+    def close(self) -> None:
+        """
+        Stop a daemon kept running with ``reuse_daemon`` (if any).
+        """
+        if self.process is not None:
+            self.process.kill()
+            self.process = None
+
+    def _get_cpu_order(self, scheduler_name: str) -> List[int]:
+        """
+        Get the CPU order given to schedkit for a policy, computed once per policy.
+
+        The topology does not change during a campaign, so the order computed
+        for the first run of a policy is reused by all its later runs.
+        """
+        if scheduler_name in self._cpu_orders:
+            return self._cpu_orders[scheduler_name]
+
+        # Determine CPU order based on policy
+        provided_order = _POLICY_CPU_ORDER.get(scheduler_name)
+        if provided_order is None:
+            cpu_order = []
+        else:
+            cpu_order = self.platform.cpu_order(provided_order=provided_order)
+
+            # Ensure CPU 0 is used first: move it from the end of the order
+            # (where "desc" puts it) to the front
+            if cpu_order[0] != 0 and cpu_order[-1] == 0:
+                cpu_order = [0] + cpu_order[:-1]
+
+        self._cpu_orders[scheduler_name] = cpu_order
+        return cpu_order
+
     def start_sched_hook(
         self,
         build_variables: RecordResult,
@@ -201,34 +319,41 @@ class SchedProcess:
         """
         assert build_variables or run_variables or True  # silence warning
 
-        self.cleanup()
-
         selected_scheduler = other_variables["scheduler"]
+        if selected_scheduler not in _SCHEDULERS_SET:
+            raise ValueError(f"Unknown scheduler: {selected_scheduler}")
+
+        # Keep the daemon of the previous run (reuse_daemon) if it still runs
+        # the same policy; otherwise stop it before cleaning up
+        if self.process is not None:
+            if (
+                selected_scheduler == self._daemon_scheduler
+                and self.process.premature_exitcode() is None
+            ):
+                return
+            self.stop()
+
+        # Nothing to clean up if no daemon ran since the last cleanup
+        # (e.g., between runs using the default scheduler)
+        if self._dirty:
+            self.cleanup()
 
         # "Normal" means use the default Linux scheduler (no intervention)
         if selected_scheduler == "Normal":
             return
 
-        self._schedkit_stdout_filename = record_data_dir / "schedkit.out"
-        self._schedkit_stderr_filename = record_data_dir / "schedkit.err"
+        if self._capture_logs:
+            self._schedkit_stdout_filename = record_data_dir / "schedkit.out"
+            self._schedkit_stderr_filename = record_data_dir / "schedkit.err"
+        else:
+            self._schedkit_stdout_filename = Path(os.devnull)
+            self._schedkit_stderr_filename = Path(os.devnull)
 
-        # Determine CPU order based on policy
-        match selected_scheduler:
-            case "CLOSE":
-                cpu_order = self.platform.cpu_order(provided_order="desc")
-            case "FAR":
-                cpu_order = self.platform.cpu_order(provided_order="even")
-            case _:
-                cpu_order = []
-
-        # Ensure CPU 0 is available for certain policies
-        if selected_scheduler in ["CLOSE", "FAR"]:
-            if cpu_order[0] != 0 and cpu_order[-1] == 0:
-                cpu_order = [cpu_order[0]] + cpu_order
+        cpu_order = self._get_cpu_order(selected_scheduler)
 
         self.start(
             scheduler_name=selected_scheduler,
-            process_filter=self._process_filter,
+            process_filter=None,
             cpu_order=cpu_order,
             schedkit_stdout_filename=self._schedkit_stdout_filename,
             schedkit_stderr_filename=self._schedkit_stderr_filename,
@@ -245,7 +370,8 @@ class SchedProcess:
         """
         assert record_data_dir or write_record_file_fun  # silence warning
 
-        self.stop()
+        if not self._reuse_daemon:
+            self.stop()
 
         return experiment_results_lines[0]
 
@@ -253,6 +379,9 @@ class SchedProcess:
 def get_scheduler(
     platform: Platform,
     process_filter: List[str] | None = None,
+    capture_logs: bool = True,
+    housekeeping_cpu: int | None = None,
+    reuse_daemon: bool = False,
 ) -> SchedProcess:
     """
     Get a configured scheduler instance for the given platform.
@@ -261,10 +390,17 @@ def get_scheduler(
         platform: Target platform.
         process_filter: List of process names to manage. Defaults to common
             benchmark process names.
+        capture_logs: Keep the daemon output of each run (see SchedProcess).
+        housekeeping_cpu: CPU to pin the daemon to (see SchedProcess).
+        reuse_daemon: Reuse the daemon across runs of the same policy (see
+            SchedProcess).
 
     Returns:
         SchedProcess instance with start_sched_hook and end_sched_hook methods
-        ready for use in campaigns.
+        ready for use in campaigns. Instances are cached per (platform,
+        process_filter, capture_logs, housekeeping_cpu, reuse_daemon), so
+        repeated calls share one instance and only the first one cleans up
+        leftover daemons.
     """
     if process_filter is None:
         process_filter = [
@@ -275,11 +411,31 @@ def get_scheduler(
             "raytracer",  # Ray tracer
         ]
 
+    return _get_scheduler(
+        platform=platform,
+        process_filter=tuple(process_filter),
+        capture_logs=capture_logs,
+        housekeeping_cpu=housekeeping_cpu,
+        reuse_daemon=reuse_daemon,
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def _get_scheduler(
+    platform: Platform,
+    process_filter: Tuple[str, ...],
+    capture_logs: bool,
+    housekeeping_cpu: int | None,
+    reuse_daemon: bool,
+) -> SchedProcess:
     schedkit = SchedProcess(
         platform=platform,
-        process_filter=process_filter,
+        process_filter=list(process_filter),
         interval_seconds=0.2,
         cpu_percentage=0.00,
+        capture_logs=capture_logs,
+        housekeeping_cpu=housekeeping_cpu,
+        reuse_daemon=reuse_daemon,
     )
     schedkit.cleanup()
 